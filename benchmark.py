@@ -0,0 +1,92 @@
+import argparse
+import sys
+
+from src.common.benchmark import (
+    IMPORT_BUDGET,
+    benchmark_solver,
+    compare,
+    format_benchmark,
+    load_baseline,
+    measure_import_time,
+    save_baseline,
+)
+from src.common.runner import discover_solvers, format_table
+
+
+def check_import_times(solver_names: list[str], budget: float) -> bool:
+    rows = [("Solver", "Import time", "Budget")]
+    within_budget = True
+
+    for solver_name in solver_names:
+        elapsed = measure_import_time(solver_name)
+        status = "ok" if elapsed <= budget else "OVER"
+        within_budget = within_budget and elapsed <= budget
+        rows.append((solver_name, f"{elapsed * 1000:.1f}ms", status))
+
+    for line in format_table(rows):
+        print(line)
+
+    return within_budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the solvers")
+    parser.add_argument(
+        "days", nargs="*", help="solvers to benchmark (ex: day01), default: all"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per part")
+    parser.add_argument("--save", metavar="PATH", help="save the results as baseline")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="flag regressions against a baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown before flagging a regression (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="only check the cold import time of the solvers against the budget",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=IMPORT_BUDGET,
+        help="import time budget per solver in seconds",
+    )
+    args = parser.parse_args()
+
+    solver_names = args.days or discover_solvers()
+
+    if args.import_time:
+        sys.exit(0 if check_import_times(solver_names, args.import_budget) else 1)
+
+    results = []
+    for solver_name in solver_names:
+        for part in (1, 2):
+            print(f"{solver_name} part {part} ...", file=sys.stderr)
+            try:
+                results.append(benchmark_solver(solver_name, part, args.repeat))
+            except Exception as e:
+                print(f"{solver_name} part {part} failed: {e!r}", file=sys.stderr)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    for line in format_benchmark(results, baseline):
+        print(line)
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(
+                f"REGRESSION {r.solver_name} part {r.part} {r.metric}:",
+                f"{r.baseline:.4g} -> {r.current:.4g}",
+            )
+
+        if regressions:
+            sys.exit(1)
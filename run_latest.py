@@ -1,12 +1,17 @@
-import sys
+import argparse
+import os
+import time
 from glob import glob
 from importlib import import_module
 
-from colorama import Fore, Back, Style
+# NOTE: imports are deferred to the functions needing them, a single fast day
+#       should not pay for colorama, the process pool or the profilers
 
 
 # display the current solver with some fancy x-mas colors
 def display_splash_title():
+    from colorama import Fore
+
     banner = [
         Fore.YELLOW + "         |",
         Fore.YELLOW + "        -+-",
@@ -133,16 +138,109 @@ def display_splash_title():
         cidx = cidx + 1
 
 
-display_splash_title()
+def run_latest():
+    from colorama import Fore
+
+    # import the latest solver and run it
+    solvers = sorted(glob("./src/solvers/day*.py"))
+    latest = solvers[-1]
+    solver_name = latest.split("/")[-1][:-3]
+
+    print(Fore.RESET, solver_name, "...")
+    solver = import_module(f"src.solvers.{ solver_name}")
+
+    print(Fore.CYAN + "Part 1" + Fore.RESET + ":", solver.solve_part1())
+    print(Fore.CYAN + "Part 2" + Fore.RESET + ":", solver.solve_part2())
+
+
+def run_every_day(max_workers: int | None):
+    from colorama import Fore
+
+    from src.common.runner import discover_solvers, format_results, run_all
+
+    # run every (day, part) pair concurrently and collect the answers in one table
+    print(Fore.RESET, "all days ...")
+
+    start = time.perf_counter()
+    results = run_all(discover_solvers(), max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+
+    lines = format_results(results)
+    print(Fore.CYAN + lines[0] + Fore.RESET)
+    for line in lines[1:]:
+        print(line)
+
+    print()
+    print(
+        Fore.CYAN + "Wall time" + Fore.RESET + f": {elapsed:.3f}s",
+        f"(sum of solvers: {sum(r.elapsed for r in results):.3f}s)",
+    )
+
+
+def profile_day(solver_name: str, parts: list[int], top: int, flame: bool):
+    from colorama import Fore
+
+    from src.common.profiling import flame_graph, profile_solver
+
+    # profile the chosen parts without having to edit the solver
+    for part in parts:
+        print(Fore.RESET, f"profiling {solver_name} part {part} ...")
+
+        path, summary = profile_solver(solver_name, part, top=top)
+        print(summary)
+        print(Fore.CYAN + "Stats" + Fore.RESET + ":", path)
+
+        if flame:
+            try:
+                path = flame_graph(solver_name, part)
+            except ImportError as e:
+                print(Fore.RED + str(e) + Fore.RESET)
+                continue
+
+            print(Fore.CYAN + "Flame graph" + Fore.RESET + ":", path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Advent of Code 2024 solvers")
+    parser.add_argument("--all", action="store_true", help="run every day concurrently")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="process pool size for --all"
+    )
+    parser.add_argument(
+        "--cache-dir", help="persist the parsed inputs in this directory (ex: .cache)"
+    )
+    parser.add_argument(
+        "--profile", metavar="DAY", help="profile a solver with cProfile (ex: day09)"
+    )
+    parser.add_argument(
+        "--part", type=int, choices=[1, 2], help="part to profile, default: both"
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="functions in the profile summary"
+    )
+    parser.add_argument(
+        "--flame",
+        action="store_true",
+        help="also write a pyinstrument flame graph (needs pyinstrument)",
+    )
+    parser.add_argument(
+        "--no-banner", action="store_true", help="skip the splash title"
+    )
+    args = parser.parse_args()
 
+    if args.cache_dir:
+        from src.common.cache import CACHE_DIR_ENV
 
-# import the latest solver and run it
-solvers = sorted(glob("./src/solvers/day*.py"))
-latest = solvers[-1]
-solver_name = latest.split("/")[-1][:-3]
+        # read by src.common.cache, also seen by the --all worker processes
+        os.environ[CACHE_DIR_ENV] = args.cache_dir
 
-print(Fore.RESET, solver_name, "...")
-solver = import_module(f"src.solvers.{ solver_name}")
+    if not args.no_banner:
+        display_splash_title()
 
-print(Fore.CYAN + "Part 1" + Fore.RESET + ":", solver.solve_part1())
-print(Fore.CYAN + "Part 2" + Fore.RESET + ":", solver.solve_part2())
+    if args.profile:
+        parts = [args.part] if args.part else [1, 2]
+        profile_day(args.profile, parts, args.top, args.flame)
+    elif args.all:
+        run_every_day(args.workers)
+    else:
+        run_latest()
@@ -0,0 +1,199 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from importlib import import_module
+from typing import NamedTuple
+
+from src.common.runner import cold_state, format_table, silence_output
+
+
+class BenchmarkResult(NamedTuple):
+    solver_name: str
+    part: int
+    min_time: float
+    median_time: float
+    peak_memory: int
+
+
+# a one-day run should start in a few tens of milliseconds
+IMPORT_BUDGET = 0.050
+
+
+class Regression(NamedTuple):
+    solver_name: str
+    part: int
+    metric: str
+    baseline: float
+    current: float
+
+
+def benchmark_solver(solver_name: str, part: int, repeat: int = 5) -> BenchmarkResult:
+    """Run a solver part several times and measure its time and memory usage.
+
+    The timed runs are done without tracemalloc since tracing slows down the
+    allocations, peak memory is measured on one extra run. Every run starts
+    cold, without cached inputs or memos from the previous runs.
+
+    Args:
+        solver_name (str): module name of the solver (ex: "day01")
+        part (int): 1 or 2
+        repeat (int): number of timed runs
+
+    Returns:
+        BenchmarkResult: min/median wall time in seconds and peak memory in bytes
+    """
+    solver = import_module(f"src.solvers.{solver_name}")
+    solve = getattr(solver, f"solve_part{part}")
+
+    timings = []
+    with silence_output():
+        for _ in range(repeat):
+            with cold_state(solver):
+                start = time.perf_counter()
+                solve()
+                timings.append(time.perf_counter() - start)
+
+        with cold_state(solver):
+            tracemalloc.start()
+            try:
+                solve()
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    return BenchmarkResult(
+        solver_name, part, min(timings), statistics.median(timings), peak_memory
+    )
+
+
+def measure_import_time(solver_name: str) -> float:
+    """Measure the cold import time of a solver with `python -X importtime`.
+
+    The import runs in a fresh interpreter so that nothing is already loaded.
+
+    Args:
+        solver_name (str): module name of the solver (ex: "day01")
+
+    Returns:
+        float: cumulative import time of the solver module in seconds
+    """
+    module = f"src.solvers.{solver_name}"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # import time: self [us] | cumulative | imported package
+    for line in process.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1_000_000
+
+    raise ValueError(f"No import time reported for {module}")
+
+
+def save_baseline(results: list[BenchmarkResult], path: str):
+    """Persist benchmark results as a JSON baseline.
+
+    Args:
+        results (list[BenchmarkResult]): results to save
+        path (str): path to the JSON file
+    """
+    with open(path, "w") as f:
+        json.dump([r._asdict() for r in results], f, indent=2)
+
+
+def load_baseline(path: str) -> list[BenchmarkResult]:
+    """Load a JSON baseline saved by save_baseline.
+
+    Args:
+        path (str): path to the JSON file
+
+    Returns:
+        list[BenchmarkResult]: saved results
+    """
+    with open(path, "r") as f:
+        return [BenchmarkResult(**r) for r in json.load(f)]
+
+
+def compare(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    threshold: float = 0.2,
+) -> list[Regression]:
+    """Find the solver parts that got slower or hungrier than the baseline.
+
+    Timings are compared on the min wall time, which is the least noisy of the
+    measurements. Parts missing from the baseline are ignored.
+
+    Args:
+        results (list[BenchmarkResult]): current results
+        baseline (list[BenchmarkResult]): reference results
+        threshold (float): allowed relative increase (0.2 = 20% slower)
+
+    Returns:
+        list[Regression]: regressions found, empty if none
+    """
+    reference = {(b.solver_name, b.part): b for b in baseline}
+
+    regressions: list[Regression] = []
+    for r in results:
+        b = reference.get((r.solver_name, r.part))
+        if b is None:
+            continue
+
+        if r.min_time > b.min_time * (1 + threshold):
+            regressions.append(
+                Regression(r.solver_name, r.part, "time", b.min_time, r.min_time)
+            )
+
+        if r.peak_memory > b.peak_memory * (1 + threshold):
+            regressions.append(
+                Regression(
+                    r.solver_name, r.part, "memory", b.peak_memory, r.peak_memory
+                )
+            )
+
+    return regressions
+
+
+def format_benchmark(
+    results: list[BenchmarkResult], baseline: list[BenchmarkResult] | None = None
+) -> list[str]:
+    """Render benchmark results as the lines of a plain text table.
+
+    Args:
+        results (list[BenchmarkResult]): results to display
+        baseline (list[BenchmarkResult] | None): adds a speedup column if given
+
+    Returns:
+        list[str]: table lines, header first
+    """
+    reference = {(b.solver_name, b.part): b for b in baseline or []}
+
+    header = ("Solver", "Part", "Min", "Median", "Peak memory")
+    if baseline is not None:
+        header += ("Speedup",)
+
+    rows = [header]
+    for r in results:
+        row = (
+            r.solver_name,
+            str(r.part),
+            f"{r.min_time:.4f}s",
+            f"{r.median_time:.4f}s",
+            f"{r.peak_memory / 1024:.1f} KiB",
+        )
+
+        if baseline is not None:
+            b = reference.get((r.solver_name, r.part))
+            row += (f"x{b.min_time / max(r.min_time, 1e-9):.2f}" if b else "-",)
+
+        rows.append(row)
+
+    return format_table(rows)
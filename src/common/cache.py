@@ -0,0 +1,231 @@
+import contextlib
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from glob import glob
+from types import ModuleType
+from typing import Any, Callable
+
+from src.common.file_utils import read_input
+
+# parsed inputs kept in memory, most recently used last
+_memory_cache: OrderedDict[str, Any] = OrderedDict()
+MAX_MEMORY_ENTRIES = 32
+
+# on-disk persistence is off unless a directory is given or set in the environment
+CACHE_DIR_ENV = "AOC_CACHE_DIR"
+MAX_DISK_ENTRIES = 64
+
+# off while measuring solvers, see cache_disabled
+_enabled = True
+
+# bumped whenever the layout of the cached entries changes
+CACHE_FORMAT_VERSION = 2
+
+# module name -> digest of its source file, the sources do not change in a process
+_source_digests: dict[str, bytes] = {}
+
+
+def _code_digest(code) -> bytes:
+    # bytecode alone misses constants and nested code (comprehensions, lambdas)
+    digest = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            digest.update(_code_digest(const))
+        else:
+            digest.update(repr(const).encode())
+    digest.update(repr(code.co_names).encode())
+
+    return digest.digest()
+
+
+def _source_digest(module_name: str) -> bytes:
+    if module_name not in _source_digests:
+        module = sys.modules.get(module_name)
+        path = getattr(module, "__file__", None)
+
+        digest = hashlib.sha256(module_name.encode())
+        if path:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _source_digests[module_name] = digest.digest()
+
+    return _source_digests[module_name]
+
+
+def parser_fingerprint(parser: Callable) -> bytes:
+    """Digest of the code a parser depends on.
+
+    Covers the source of the parser's module and of the project modules it
+    uses (ex: src.common.grid for a parser building a Grid), so editing a
+    helper or a class layout changes the fingerprint. Parsers without a
+    source file fall back to their code objects, walked recursively.
+
+    Args:
+        parser (Callable): function parsing the lines
+
+    Returns:
+        bytes: fingerprint of the parser
+    """
+    module = sys.modules.get(parser.__module__)
+    if getattr(module, "__file__", None) is None:
+        return _code_digest(parser.__code__)
+
+    modules = {parser.__module__}
+    for value in vars(module).values():
+        if isinstance(value, ModuleType):
+            name = value.__name__
+        else:
+            name = getattr(value, "__module__", None)
+        if isinstance(name, str) and name.split(".")[0] == "src":
+            modules.add(name)
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(_source_digest(name))
+
+    return digest.digest()
+
+
+def cache_key(lines: list[str], parser: Callable) -> str:
+    """Build the cache key of a parsed input.
+
+    The key changes whenever the input content, the code of the parser (see
+    parser_fingerprint) or the cache format changes, so stale entries are
+    not returned.
+
+    Args:
+        lines (list[str]): input lines
+        parser (Callable): function parsing the lines
+
+    Returns:
+        str: key usable as a file name
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode())
+    digest.update("".join(lines).encode())
+    digest.update(parser_fingerprint(parser))
+
+    return f"{parser.__module__}.{parser.__qualname__}-{digest.hexdigest()[:32]}"
+
+
+def cached_parse(
+    source: str | list[str], parser: Callable, cache_dir: str | None = None
+) -> Any:
+    """Parse an input once, reusing the result across parts and runs.
+
+    The parsed structure is shared between callers, so solvers must not modify
+    it. Results are pickled to the cache directory (if any) with LRU eviction.
+
+    Args:
+        source (str | list[str]): path to a file, or lines already in memory
+        parser (Callable): function taking the input lines
+        cache_dir (str | None): directory for the pickled results,
+            defaults to the AOC_CACHE_DIR environment variable
+
+    Returns:
+        Any: the parsed input, as returned by parser
+    """
+    lines = read_input(source)
+    if not _enabled:
+        return parser(lines)
+
+    key = cache_key(lines, parser)
+
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    cache_dir = resolve_cache_dir(cache_dir)
+    parsed = None
+
+    if cache_dir:
+        parsed = _load(cache_dir, key)
+
+    if parsed is None:
+        parsed = parser(lines)
+
+        if cache_dir:
+            _store(cache_dir, key, parsed)
+
+    _memory_cache[key] = parsed
+    if len(_memory_cache) > MAX_MEMORY_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+    return parsed
+
+
+def resolve_cache_dir(cache_dir: str | None = None) -> str | None:
+    """Directory for the on-disk cache, None when caching is off."""
+    if not _enabled:
+        return None
+
+    return cache_dir or os.environ.get(CACHE_DIR_ENV)
+
+
+@contextlib.contextmanager
+def cache_disabled():
+    """Parse every input from scratch, ignoring the memory and disk caches.
+
+    Used by the benchmark and the profiler, which would otherwise measure
+    cache hits after the first run.
+    """
+    global _enabled
+
+    previous = _enabled
+    _enabled = False
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+def clear_cache(cache_dir: str | None = None):
+    """Forget every parsed input, in memory and in the cache directory.
+
+    Args:
+        cache_dir (str | None): directory for the pickled results,
+            defaults to the AOC_CACHE_DIR environment variable
+    """
+    _memory_cache.clear()
+
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        for path in glob(f"{cache_dir}/*.pickle"):
+            os.remove(path)
+
+
+def _load(cache_dir: str, key: str) -> Any:
+    # pickle is only imported when the on-disk cache is used
+    import pickle
+
+    path = f"{cache_dir}/{key}.pickle"
+    try:
+        with open(path, "rb") as f:
+            parsed = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    # touch the entry so the eviction keeps the most recently used ones
+    os.utime(path)
+    return parsed
+
+
+def _store(cache_dir: str, key: str, parsed: Any):
+    import pickle
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write then rename, concurrent solvers never see a partial pickle
+    path = f"{cache_dir}/{key}.pickle"
+    with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+        pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+    entries = sorted(glob(f"{cache_dir}/*.pickle"), key=os.path.getmtime)
+    for stale in entries[: max(0, len(entries) - MAX_DISK_ENTRIES)]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
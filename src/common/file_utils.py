@@ -1,3 +1,6 @@
+from typing import Any, Callable, Iterable, Iterator
+
+
 def read_lines(path) -> list[str]:
     """Enumerate lines in a file.
 
@@ -9,3 +12,87 @@ def read_lines(path) -> list[str]:
     """
     with open(path, "r") as f:
         return f.readlines()
+
+
+def read_input(source: str | list[str]) -> list[str]:
+    """Enumerate lines of a puzzle input.
+
+    Args:
+        source (str | list[str]): path to a file, or lines already in memory
+            (with their line endings, as returned by read_lines)
+
+    Returns:
+        list[str]: list of lines in the input
+    """
+    if isinstance(source, str):
+        return read_lines(source)
+
+    return list(source)
+
+
+def read_text(source: str | Iterable[str]) -> str:
+    """Read a whole puzzle input as a single string, for bulk parsing.
+
+    Args:
+        source (str | Iterable[str]): path to a file, or lines already in memory
+            (with their line endings, as returned by read_lines)
+
+    Returns:
+        str: content of the input
+    """
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            return f.read()
+
+    return "".join(source)
+
+
+def iter_chunks(
+    source: str | Iterable[str], chunk_size: int = 1 << 16
+) -> Iterator[str]:
+    """Stream an input in fixed-size chunks, in constant memory.
+
+    Chunks are cut anywhere, including in the middle of a line or a token.
+
+    Args:
+        source (str | Iterable[str]): path to a file, or lines already in memory
+            (with their line endings, as returned by read_lines)
+        chunk_size (int): number of characters per chunk read from a file
+
+    Yields:
+        str: next chunk of the input, lines in memory are yielded as-is
+    """
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    else:
+        yield from source
+
+
+def iter_lines(
+    source: str | Iterable[str], tokenize: Callable[[str], Any] | None = None
+) -> Iterator[Any]:
+    """Stream the lines of an input without loading the whole file.
+
+    Args:
+        source (str | Iterable[str]): path to a file, or lines already in memory
+        tokenize (Callable[[str], Any] | None): applied to every line before it
+            is yielded, ex: str.split
+
+    Yields:
+        Any: the line without its line ending, or its tokens
+    """
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            yield from _strip_lines(f, tokenize)
+    else:
+        yield from _strip_lines(source, tokenize)
+
+
+def _strip_lines(
+    lines: Iterable[str], tokenize: Callable[[str], Any] | None
+) -> Iterator[Any]:
+    for line in lines:
+        line = line.rstrip("\r\n")
+        yield line if tokenize is None else tokenize(line)
@@ -0,0 +1,142 @@
+import mmap
+from typing import Iterator, Tuple
+
+# 4-connected neighbors: up, right, down, left
+ADJACENT_OFFSETS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+class Grid:
+    """Character grid read straight from the input bytes.
+
+    Cells are never materialised: the grid is a view over the raw input (a
+    memory-mapped file or a bytes buffer) where row y starts at y * stride, the
+    stride accounting for the line ending. Cells are indexed as grid[x, y].
+    """
+
+    __slots__ = ("data", "width", "height", "stride")
+
+    def __init__(self, data: bytes | bytearray | mmap.mmap):
+        self.data = data
+
+        end = len(data)
+        while end > 0 and data[end - 1] in b"\r\n":
+            end -= 1
+
+        width = data.find(b"\n", 0, end)
+        if width < 0:
+            # single line, no line ending
+            self.width = end
+            self.stride = end + 1
+            self.height = 1 if end > 0 else 0
+            return
+
+        self.stride = width + 1
+        if width > 0 and data[width - 1] == ord("\r"):
+            width -= 1
+
+        self.width = width
+        self.height = (end + self.stride - width) // self.stride
+
+    @staticmethod
+    def from_file(path: str) -> "Grid":
+        """Memory-map a grid file, loading it in constant time.
+
+        Args:
+            path (str): path to file
+
+        Returns:
+            Grid: grid over the mapped file
+        """
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return Grid(b"")
+
+            # the mapping stays valid once the file is closed
+            return Grid(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def from_lines(lines: list[str]) -> "Grid":
+        """Build a grid from lines already in memory.
+
+        Args:
+            lines (list[str]): grid rows, with or without their line endings
+
+        Returns:
+            Grid: grid over a single bytes buffer
+        """
+        rows = [line.rstrip("\r\n") for line in lines]
+        while rows and len(rows[-1]) == 0:
+            rows.pop()
+
+        return Grid("\n".join(rows).encode())
+
+    @staticmethod
+    def from_source(source: str | list[str]) -> "Grid":
+        """Build a grid from a path or from lines, see read_input.
+
+        Args:
+            source (str | list[str]): path to a file, or lines already in memory
+
+        Returns:
+            Grid: grid over the input
+        """
+        if isinstance(source, str):
+            return Grid.from_file(source)
+
+        return Grid.from_lines(source)
+
+    def __reduce__(self):
+        # mmap objects cannot be pickled, send the bytes instead
+        return (Grid, (bytes(self.data),))
+
+    def __getitem__(self, pos: Tuple[int, int]) -> str:
+        x, y = pos
+        return chr(self.data[y * self.stride + x])
+
+    def byte(self, x: int, y: int) -> int:
+        """Raw byte value of a cell, ex: grid.byte(x, y) - ord("0") for digits."""
+        return self.data[y * self.stride + x]
+
+    def get(self, pos: Tuple[int, int], default: str | None = None) -> str | None:
+        """Cell at pos, or default when pos is outside of the grid."""
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return chr(self.data[y * self.stride + x])
+
+        return default
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def neighbors(self, x: int, y: int) -> Iterator[Tuple[int, int]]:
+        """Enumerate the 4-connected neighbors of a cell inside the grid."""
+        for dx, dy in ADJACENT_OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield (nx, ny)
+
+    def row(self, y: int) -> bytes:
+        """Raw bytes of a row, without its line ending."""
+        return self.data[y * self.stride : y * self.stride + self.width]
+
+    def find(self, char: str) -> Tuple[int, int] | None:
+        """Position of the first cell holding char, scanning the raw bytes."""
+        return next(self.find_all(char), None)
+
+    def find_all(self, char: str) -> Iterator[Tuple[int, int]]:
+        """Enumerate the positions of the cells holding char, in reading order."""
+        needle = char.encode()
+        i = self.data.find(needle)
+        while i >= 0:
+            y, x = divmod(i, self.stride)
+            if x < self.width:
+                yield (x, y)
+            i = self.data.find(needle, i + 1)
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], str]]:
+        """Enumerate ((x, y), char) for every cell, in reading order."""
+        for y in range(self.height):
+            offset = y * self.stride
+            for x, b in enumerate(self.data[offset : offset + self.width]):
+                yield (x, y), chr(b)
@@ -0,0 +1,89 @@
+import cProfile
+import io
+import os
+import pstats
+from importlib import import_module
+
+from src.common.runner import cold_state, silence_output
+
+
+def profile_solver(
+    solver_name: str,
+    part: int,
+    output_dir: str = "profiles",
+    top: int = 20,
+    quiet: bool = True,
+) -> tuple[str, str]:
+    """Run a solver part under cProfile.
+
+    The raw stats are written to <output_dir>/<solver>_part<N>.pstats, to be
+    explored with `python -m pstats` or snakeviz.
+
+    Args:
+        solver_name (str): module name of the solver (ex: "day09")
+        part (int): 1 or 2
+        output_dir (str): directory for the .pstats file
+        top (int): number of functions in the summary
+        quiet (bool): swallow whatever the solver prints
+
+    Returns:
+        tuple[str, str]: path to the .pstats file, top-N summary by own time
+    """
+    solver = import_module(f"src.solvers.{solver_name}")
+    solve = getattr(solver, f"solve_part{part}")
+
+    profiler = cProfile.Profile()
+    with silence_output(quiet), cold_state(solver):
+        profiler.runcall(solve)
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = f"{output_dir}/{solver_name}_part{part}.pstats"
+    profiler.dump_stats(path)
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.strip_dirs().sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+    return path, summary.getvalue()
+
+
+def flame_graph(
+    solver_name: str, part: int, output_dir: str = "profiles", quiet: bool = True
+) -> str:
+    """Run a solver part under the pyinstrument sampling profiler.
+
+    pyinstrument is optional and only needed for this mode.
+
+    Args:
+        solver_name (str): module name of the solver (ex: "day09")
+        part (int): 1 or 2
+        output_dir (str): directory for the .html flame graph
+        quiet (bool): swallow whatever the solver prints
+
+    Returns:
+        str: path to the .html flame graph
+    """
+    try:
+        from pyinstrument import Profiler
+    except ImportError as e:
+        raise ImportError(
+            "flame graphs need pyinstrument: pip install pyinstrument"
+        ) from e
+
+    solver = import_module(f"src.solvers.{solver_name}")
+    solve = getattr(solver, f"solve_part{part}")
+
+    profiler = Profiler()
+    with silence_output(quiet), cold_state(solver):
+        profiler.start()
+        try:
+            solve()
+        finally:
+            profiler.stop()
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = f"{output_dir}/{solver_name}_part{part}.html"
+    with open(path, "w") as f:
+        f.write(profiler.output_html())
+
+    return path
@@ -0,0 +1,9 @@
+def tqdm(*args, **kwargs):
+    """tqdm progress bar, imported on first use.
+
+    tqdm takes longer to import than most solvers take to run, this keeps it
+    out of the startup path.
+    """
+    from tqdm import tqdm as _tqdm
+
+    return _tqdm(*args, **kwargs)
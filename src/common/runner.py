@@ -0,0 +1,172 @@
+import contextlib
+import io
+import time
+import traceback
+from glob import glob
+from importlib import import_module
+from types import ModuleType
+from typing import Any, NamedTuple
+
+
+class SolverResult(NamedTuple):
+    solver_name: str
+    part: int
+    answer: Any
+    elapsed: float
+    error: str | None = None
+
+
+@contextlib.contextmanager
+def silence_output(enabled: bool = True):
+    """Swallow stdout and stderr (prints, progress bars) while enabled."""
+    if not enabled:
+        yield
+        return
+
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        yield
+
+
+@contextlib.contextmanager
+def cold_state(solver: ModuleType):
+    """Run a solver as if in a fresh process, for measurements.
+
+    The parse cache is bypassed, and the solver's own memos are dropped
+    through its optional reset_state() hook.
+    """
+    from src.common.cache import cache_disabled
+
+    reset_state = getattr(solver, "reset_state", None)
+    if reset_state is not None:
+        reset_state()
+
+    with cache_disabled():
+        yield
+
+
+def discover_solvers(path: str = "./src/solvers") -> list[str]:
+    """Enumerate solver modules, sorted by day.
+
+    Args:
+        path (str): directory containing the dayNN.py solvers
+
+    Returns:
+        list[str]: module names of the solvers (ex: "day01")
+    """
+    return [p.split("/")[-1][:-3] for p in sorted(glob(f"{path}/day*.py"))]
+
+
+def run_solver(
+    solver_name: str,
+    part: int,
+    quiet: bool = True,
+    source: str | list[str] | None = None,
+    params: dict[str, Any] | None = None,
+) -> SolverResult:
+    """Import a solver and run one of its parts, timing the call.
+
+    The solver module stays imported, so repeated calls with different inputs
+    run in the same warm process.
+
+    Args:
+        solver_name (str): module name of the solver (ex: "day01")
+        part (int): 1 or 2
+        quiet (bool): swallow whatever the solver prints (progress bars, debug maps)
+        source (str | list[str] | None): input path or lines, defaults to the
+            solver's own puzzle input
+        params (dict[str, Any] | None): extra solver parameters (ex: map_size)
+
+    Returns:
+        SolverResult: answer and wall time, or the error if the solver failed
+    """
+    start = time.perf_counter()
+    try:
+        with silence_output(quiet):
+            solver = import_module(f"src.solvers.{solver_name}")
+
+            # only time the solver itself, not the import
+            start = time.perf_counter()
+            solve = getattr(solver, f"solve_part{part}")
+            if source is None:
+                answer = solve(**(params or {}))
+            else:
+                answer = solve(source, **(params or {}))
+
+    except Exception:
+        elapsed = time.perf_counter() - start
+        error = traceback.format_exc().strip().splitlines()[-1]
+        return SolverResult(solver_name, part, None, elapsed, error)
+
+    return SolverResult(solver_name, part, answer, time.perf_counter() - start)
+
+
+def run_all(
+    solver_names: list[str], parts: tuple[int, ...] = (1, 2), max_workers=None
+) -> list[SolverResult]:
+    """Run every (solver, part) pair concurrently across a process pool.
+
+    Each pair runs in its own task, so a full sweep takes about as long as the
+    slowest solver instead of the sum of all of them.
+
+    Args:
+        solver_names (list[str]): module names of the solvers to run
+        parts (tuple[int, ...]): parts to run for each solver
+        max_workers (int | None): pool size, defaults to the cpu count
+
+    Returns:
+        list[SolverResult]: results sorted by solver and part
+    """
+    # deferred, the process pool machinery is slow to import
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results: list[SolverResult] = []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_solver, solver_name, part)
+            for solver_name in solver_names
+            for part in parts
+        ]
+
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    return sorted(results, key=lambda r: (r.solver_name, r.part))
+
+
+def format_table(rows: list[tuple[str, ...]]) -> list[str]:
+    """Render rows as the lines of a plain text table.
+
+    Args:
+        rows (list[tuple[str, ...]]): header row first, then the data rows
+
+    Returns:
+        list[str]: table lines, header first
+    """
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+    lines = []
+    for row in rows:
+        lines.append(" | ".join(cell.ljust(w) for cell, w in zip(row, widths)))
+
+    lines.insert(1, "-+-".join("-" * w for w in widths))
+
+    return lines
+
+
+def format_results(results: list[SolverResult]) -> list[str]:
+    """Render the results as the lines of a plain text table.
+
+    Args:
+        results (list[SolverResult]): results to display
+
+    Returns:
+        list[str]: table lines, header first
+    """
+    rows = [("Solver", "Part", "Answer", "Time")]
+    for r in results:
+        answer = r.error if r.error is not None else str(r.answer)
+        rows.append((r.solver_name, str(r.part), answer, f"{r.elapsed:.3f}s"))
+
+    return format_table(rows)
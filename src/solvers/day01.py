@@ -1,48 +1,31 @@
+from collections import Counter
+from operator import sub
 from typing import Tuple
-from src.common.file_utils import read_lines
-import re
+from src.common.file_utils import read_text
 
 
-def parse_input(lines: list[str]) -> Tuple[list, list]:
-    left: list[int] = []
-    right: list[int] = []
+def parse_input(text: str) -> Tuple[list[int], list[int]]:
+    # one split over the whole input, the columns are the even and odd tokens
+    numbers = list(map(int, text.split()))
+    if len(numbers) % 2 != 0:
+        raise ValueError("Both lists must have the same length")
 
-    for line in lines:
-        # extract the numbers from the line using a regular expression
-        numbers = re.findall(r"\d+", line)
+    return (numbers[0::2], numbers[1::2])
 
-        if len(numbers) != 2:
-            break
 
-        left.append(int(numbers[0]))
-        right.append(int(numbers[1]))
+def solve_part1(source: str | list[str] = "input/day01/part1.txt") -> int:
+    left, right = parse_input(read_text(source))
 
-    return (left, right)
+    left.sort()
+    right.sort()
 
+    return sum(map(abs, map(sub, left, right)))
 
-def solve_part1() -> int:
-    lines = read_lines("input/day01/part1.txt")
-    left, right = parse_input(lines)
 
-    sorted_left = sorted(left)
-    sorted_right = sorted(right)
+def solve_part2(source: str | list[str] = "input/day01/part1.txt") -> int:
+    left, right = parse_input(read_text(source))
 
-    total = 0
-    for i in range(0, len(sorted_left)):
-        distance = abs(sorted_left[i] - sorted_right[i])
-        total += distance
+    # histogram of the right list, each lookup is O(1)
+    occurences = Counter(right)
 
-    return total
-
-
-def solve_part2() -> int:
-    lines = read_lines("input/day01/part1.txt")
-    left, right = parse_input(lines)
-
-    total = 0
-    for i in range(0, len(left)):
-        number = left[i]
-        occurences = right.count(number)
-        total += number * occurences
-
-    return total
+    return sum(number * occurences[number] for number in left)
@@ -1,79 +1,109 @@
-from typing import Tuple
-from src.common.file_utils import read_lines
-import re
+from operator import sub
+from typing import Iterable, Iterator
+from src.common.file_utils import iter_lines
 
+# a report is either increasing (1) or decreasing (-1)
+DIRECTIONS = (1, -1)
 
-def parse_input(lines: list[str]) -> Tuple[list, list]:
-    levels: list[list[int]] = []
 
-    for line in lines:
-        # extract the numbers from the line using a regular expression
-        numbers = re.findall(r"\d+", line)
+def parse_input(records: Iterable[list[str]]) -> Iterator[list[int]]:
+    # reports are yielded one at a time, the input is never fully loaded
+    for numbers in records:
         if len(numbers) == 0:
-            break
+            return
 
-        levels.append([int(i) for i in numbers])
+        yield [int(i) for i in numbers]
 
-    return levels
 
+def level_deltas(row: list[int]) -> list[int]:
+    # deltas[i] is the step between the levels i and i + 1
+    return list(map(sub, row[1:], row[:-1]))
 
-def is_safe(row: list[int]) -> bool:
-    row_len = len(row)
 
-    sign = -1 if row[0] > row[1] else 1
-    for i in range(0, row_len - 1):
-        if sign == -1 and row[i] < row[i + 1]:
-            return False
-        if sign == 1 and row[i] > row[i + 1]:
-            return False
+def is_safe_step(delta: int, direction: int) -> bool:
+    return 1 <= delta * direction <= 3
 
-        diff = abs(row[i] - row[i + 1])
-        if diff > 3:
-            return False
 
-        if diff < 1:
-            return False
+def is_safe_deltas(deltas: list[int], dampener: bool = False) -> bool:
+    """Check a report from its level deltas, in a single pass per direction.
 
-    return True
+    With the dampener, only the two levels around the first unsafe step can
+    fix the report: removing any other level leaves that step in place.
+    Removing a level merges the two steps around it, so the candidates are
+    tested on the deltas without building a new report.
 
+    Args:
+        deltas (list[int]): level deltas of the report, see level_deltas
+        dampener (bool): tolerate a single bad level
 
-def is_safe_with_dampener(row: list[int]) -> bool:
-    if is_safe(row):
-        return True
-
-    # see if we can make it safe by removing one number
-    for k in range(0, len(row)):
-        row_copy = row.copy()
-        row_copy.pop(k)
-        if is_safe(row_copy):
+    Returns:
+        bool: True if the report is safe
+    """
+    # the dampener can fix at most two unsafe steps (around the same level)
+    tolerance = 2 if dampener else 0
+
+    for direction in DIRECTIONS:
+        unsafe: list[int] = []
+        for i, d in enumerate(deltas):
+            if not 1 <= d * direction <= 3:
+                unsafe.append(i)
+                if len(unsafe) > tolerance:
+                    break
+
+        if len(unsafe) == 0:
+            return True
+
+        if len(unsafe) > tolerance:
+            continue
+
+        i = unsafe[0]
+        last = len(deltas) - 1
+
+        # remove level i : steps i - 1 and i merge (the first level just drops)
+        if len(unsafe) == 1 and (
+            i == 0 or i == last or is_safe_step(deltas[i - 1] + deltas[i], direction)
+        ):
+            return True
+
+        # remove level i + 1 : steps i and i + 1 merge
+        if (
+            i < last
+            and unsafe[-1] <= i + 1
+            and is_safe_step(deltas[i] + deltas[i + 1], direction)
+        ):
             return True
 
     return False
 
 
-def solve_part1() -> int:
-    lines = read_lines("input/day02/part1.txt")
-    # lines = read_lines("input/day02/example.txt")
+def count_safe(delta_rows: Iterable[list[int]], dampener: bool = False) -> int:
+    """Count the safe reports of a batch, given as rows of level deltas.
+
+    Args:
+        delta_rows (Iterable[list[int]]): level deltas of every report
+        dampener (bool): tolerate a single bad level per report
+
+    Returns:
+        int: number of safe reports
+    """
+    return sum(1 for deltas in delta_rows if is_safe_deltas(deltas, dampener))
 
-    levels = parse_input(lines)
 
-    safe_levels = 0
-    for row in levels:
-        if is_safe(row):
-            safe_levels += 1
+def is_safe(row: list[int]) -> bool:
+    return is_safe_deltas(level_deltas(row))
+
+
+def is_safe_with_dampener(row: list[int]) -> bool:
+    return is_safe_deltas(level_deltas(row), dampener=True)
 
-    return safe_levels
 
+def solve_part1(source: str | list[str] = "input/day02/part1.txt") -> int:
+    levels = parse_input(iter_lines(source, str.split))
 
-def solve_part2() -> int:
-    lines = read_lines("input/day02/part1.txt")
-    # lines = read_lines("input/day02/example.txt")
+    return count_safe(map(level_deltas, levels))
 
-    levels = parse_input(lines)
 
-    safe_levels = 0
-    for row in levels:
-        if is_safe_with_dampener(row):
-            safe_levels += 1
+def solve_part2(source: str | list[str] = "input/day02/part1.txt") -> int:
+    levels = parse_input(iter_lines(source, str.split))
 
-    return safe_levels
+    return count_safe(map(level_deltas, levels), dampener=True)
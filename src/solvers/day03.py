@@ -1,46 +1,64 @@
-from typing import Tuple
-from src.common.file_utils import read_lines
+from typing import Iterable, Iterator
+from src.common.file_utils import iter_chunks
 import re
 
+# operands of mul in groups 1 and 2, do in group 3, don't in group 4
+INSTRUCTION = re.compile(r"mul\((\d+),(\d+)\)|(do)\(\)|(don't)\(\)")
 
-def solve_part1() -> int:
-    lines = read_lines("input/day03/part1.txt")
-    # lines = read_lines("input/day02/example.txt")
+# start of an instruction cut by the end of a chunk
+PARTIAL_INSTRUCTION = re.compile(r"m(u(l(\(\d*(,\d*)?)?)?)?|d(o(\(|n('(t\(?)?)?)?)?")
 
-    total = 0
 
-    for line in lines:
-        sequences = re.findall(r"mul\(\d+,\d+\)", line)
+def scan_instructions(chunks: Iterable[str]) -> Iterator[re.Match]:
+    """Find the instructions of the corrupted memory, streamed in chunks.
 
-        for sequence in sequences:
-            numbers = re.findall(r"\d+", sequence)
-            total += int(numbers[0]) * int(numbers[1])
+    An instruction cut by the end of a chunk is carried over to the next one.
+    The carry only holds the tail of the chunk that can still become an
+    instruction, which starts at its last "m" or "d", so memory stays bounded
+    by the chunk size.
 
-    return total
+    Args:
+        chunks (Iterable[str]): consecutive pieces of the memory, see iter_chunks
+
+    Yields:
+        re.Match: next instruction, with the groups of INSTRUCTION
+    """
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+
+        end = 0
+        for match in INSTRUCTION.finditer(buffer):
+            yield match
+            end = match.end()
 
+        start = max(buffer.rfind("m", end), buffer.rfind("d", end))
+        if start >= 0 and PARTIAL_INSTRUCTION.fullmatch(buffer, start):
+            carry = buffer[start:]
+        else:
+            carry = ""
 
-def solve_part2() -> int:
-    lines = read_lines("input/day03/part1.txt")
-    # lines = read_lines("input/day02/example.txt")
 
+def solve_part1(source: str | list[str] = "input/day03/part1.txt") -> int:
     total = 0
-    mul_active = True
 
-    for line in lines:
-        sequences = re.findall(r"(mul\(\d+,\d+\)|do\(\)|don't\(\))", line)
+    for instruction in scan_instructions(iter_chunks(source)):
+        if instruction[1] is not None:
+            total += int(instruction[1]) * int(instruction[2])
 
-        for sequence in sequences:
+    return total
 
-            if sequence == "do()":
-                mul_active = True
-                continue
 
-            if sequence == "don't()":
-                mul_active = False
-                continue
+def solve_part2(source: str | list[str] = "input/day03/part1.txt") -> int:
+    total = 0
+    mul_active = True
 
-            if mul_active:
-                numbers = re.findall(r"\d+", sequence)
-                total += int(numbers[0]) * int(numbers[1])
+    for instruction in scan_instructions(iter_chunks(source)):
+        if instruction[3] is not None:
+            mul_active = True
+        elif instruction[4] is not None:
+            mul_active = False
+        elif mul_active:
+            total += int(instruction[1]) * int(instruction[2])
 
     return total
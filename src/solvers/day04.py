@@ -1,223 +1,134 @@
-from typing import Tuple
-from src.common.file_utils import read_lines
-import re
-
-
-def parse_xmas_grid(lines: list[str]) -> list[list[chr]]:
-    grid: list[list[chr]] = []
-
-    for line in lines:
-        grid.append([c for c in line if c != "\n"])
-
-    return grid
-
-
-def reduce_grid(grid: list[list[chr]]) -> int:
-
-    grid_width = len(grid[0])
-    grid_height = len(grid)
-
-    # match_grid:list[list[int]] = [[0 for i in range(grid_width)] for j in range(grid_height)]
-    hits = 0
-
-    # XMAS  <=> SAMX
-    for i in range(0, grid_height):
-        for j in range(0, grid_width - 3):
-
-            if (
-                grid[i][j] == "X"
-                and grid[i][j + 1] == "M"
-                and grid[i][j + 2] == "A"
-                and grid[i][j + 3] == "S"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i][j+1] += 1
-                # match_grid[i][j+2] += 1
-                # match_grid[i][j+3] += 1
-                hits = hits + 1
-
-            elif (
-                grid[i][j] == "S"
-                and grid[i][j + 1] == "A"
-                and grid[i][j + 2] == "M"
-                and grid[i][j + 3] == "X"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i][j+1] += 1
-                # match_grid[i][j+2] += 1
-                # match_grid[i][j+3] += 1
-                hits = hits + 1
-
-    # X        S
-    #  M   <=>  A
-    #   A        M
-    #    S        X
-    for i in range(0, grid_height - 3):
-        for j in range(0, grid_width - 3):
-
-            if (
-                grid[i][j] == "X"
-                and grid[i + 1][j + 1] == "M"
-                and grid[i + 2][j + 2] == "A"
-                and grid[i + 3][j + 3] == "S"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i+1][j+1] += 1
-                # match_grid[i+2][j+2] += 1
-                # match_grid[i+3][j+3] += 1
-                hits = hits + 1
-
-            elif (
-                grid[i][j] == "S"
-                and grid[i + 1][j + 1] == "A"
-                and grid[i + 2][j + 2] == "M"
-                and grid[i + 3][j + 3] == "X"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i+1][j+1] += 1
-                # match_grid[i+2][j+2] += 1
-                # match_grid[i+3][j+3] += 1
-                hits = hits + 1
-
-    # X     S
-    # M  <=>A
-    # A     M
-    # S     X
-    for i in range(0, grid_height - 3):
-        for j in range(0, grid_width):
-
-            if (
-                grid[i][j] == "X"
-                and grid[i + 1][j] == "M"
-                and grid[i + 2][j] == "A"
-                and grid[i + 3][j] == "S"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i+1][j] += 1
-                # match_grid[i+2][j] += 1
-                # match_grid[i+3][j] += 1
-                hits = hits + 1
-
-            elif (
-                grid[i][j] == "S"
-                and grid[i + 1][j] == "A"
-                and grid[i + 2][j] == "M"
-                and grid[i + 3][j] == "X"
-            ):
-                # match_grid[i][j] += 1
-                # match_grid[i+1][j] += 1
-                # match_grid[i+2][j] += 1
-                # match_grid[i+3][j] += 1
-                hits = hits + 1
-
-    #    S         X
-    #   A         M
-    #  M   <=>   A
-    # X         S
-    for i in range(0, grid_height - 3):
-        for j in range(0, grid_width - 3):
-
-            if (
-                grid[i + 3][j] == "X"
-                and grid[i + 2][j + 1] == "M"
-                and grid[i + 1][j + 2] == "A"
-                and grid[i][j + 3] == "S"
-            ):
-                # match_grid[i+3][j] += 1
-                # match_grid[i+2][j+1] += 1
-                # match_grid[i+1][j+2] += 1
-                # match_grid[i][j+3] += 1
-                hits = hits + 1
-
-            elif (
-                grid[i + 3][j] == "S"
-                and grid[i + 2][j + 1] == "A"
-                and grid[i + 1][j + 2] == "M"
-                and grid[i][j + 3] == "X"
-            ):
-                # match_grid[i+3][j] += 1
-                # match_grid[i+2][j+1] += 1
-                # match_grid[i+1][j+2] += 1
-                # match_grid[i][j+3] += 1
-                hits = hits + 1
-
-    # print("Match Grid")
-    # for row in match_grid:
-    #     print(row)
+from collections import Counter
+import sys
+from typing import Iterable, Iterator, Tuple
+from src.common.grid import Grid
 
-    return hits
+# (dx, dy) unit steps, horizontal and vertical then diagonal
+ALL_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+DIAGONALS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
 
 
-def reduce_grid2(grid: list[list[chr]]) -> int:
+def _steps_in_bounds(position: int, step: int, size: int) -> int:
+    # number of cells reached from position, moving by step, before leaving [0, size)
+    if step > 0:
+        return (size - 1 - position) // step + 1
+    if step < 0:
+        return position // -step + 1
 
-    grid_width = len(grid[0])
-    grid_height = len(grid)
+    # no constraint along this axis
+    return sys.maxsize
 
-    # match_grid:list[list[int]] = [[0 for i in range(grid_width)] for j in range(grid_height)]
-    hits = 0
 
-    # search only for cross MAS match
-    #  ex:  M S
-    #        A
-    #       M S
-    for i in range(1, grid_height - 1):
-        for j in range(1, grid_width - 1):
-            if grid[i][j] != "A":
-                continue
+def scan_lines(grid: Grid, dx: int, dy: int) -> Iterator[Tuple[int, int, bytes]]:
+    """Enumerate the lines of a grid read along a direction.
 
-            if grid[i - 1][j - 1] not in ["M", "S"]:
-                continue
+    A line starts on every cell whose previous cell along (dx, dy) is outside
+    of the grid, and is read straight from the grid bytes as a stepped slice,
+    ex: the columns for (0, 1), the rows read right to left for (-1, 0).
 
-            if grid[i + 1][j + 1] not in ["M", "S"]:
-                continue
+    Args:
+        grid (Grid): grid to read
+        dx (int): horizontal step
+        dy (int): vertical step
 
-            if grid[i - 1][j + 1] not in ["M", "S"]:
-                continue
+    Yields:
+        Tuple[int, int, bytes]: x, y of the first cell and content of the line
+    """
+    if dx == 0 and dy == 0:
+        raise ValueError("Direction (0, 0) does not move")
 
-            if grid[i + 1][j - 1] not in ["M", "S"]:
-                continue
+    # lines start within |dx| columns or |dy| rows of the edge they leave from
+    start_columns = range(dx) if dx > 0 else range(grid.width + dx, grid.width)
+    start_rows = range(dy) if dy > 0 else range(grid.height + dy, grid.height)
 
-            if grid[i - 1][j - 1] == grid[i + 1][j + 1]:
-                continue
+    starts = {(x, y) for x in start_columns for y in range(grid.height)}
+    starts |= {(x, y) for x in range(grid.width) for y in start_rows}
 
-            if grid[i - 1][j + 1] == grid[i + 1][j - 1]:
-                continue
+    step = dy * grid.stride + dx
+    for x, y in sorted(starts, key=lambda p: (p[1], p[0])):
+        if not grid.in_bounds(x, y):
+            continue
 
-            # match_grid[i-1][j-1] += 1
-            # match_grid[i+1][j+1] += 1
-            # match_grid[i][j] += 1
-            # match_grid[i-1][j+1] += 1
-            # match_grid[i+1][j-1] += 1
-            hits = hits + 1
+        length = min(
+            _steps_in_bounds(x, dx, grid.width), _steps_in_bounds(y, dy, grid.height)
+        )
 
-    # print("Match Grid")
-    # for row in match_grid:
-    #     print(row)
+        start = y * grid.stride + x
+        stop = start + length * step
+        yield x, y, grid.data[start : stop if stop >= 0 else None : step]
 
-    return hits
 
+def find_word(
+    grid: Grid, word: str, directions: Iterable[Tuple[int, int]] = ALL_DIRECTIONS
+) -> Iterator[Tuple[int, int, int, int]]:
+    """Find every occurrence of a word, read along any of the directions.
 
-def solve_part1() -> int:
-    # lines = read_lines("input/day04/example.txt")
-    lines = read_lines("input/day04/part1.txt")
-    grid = parse_xmas_grid(lines)
+    Each direction is searched with substring scans over its lines, so a new
+    word or direction needs no new loop. Overlapping occurrences are found.
 
-    # for row in grid:
-    #     print(row)
+    Args:
+        grid (Grid): grid to search
+        word (str): word to find
+        directions (Iterable[Tuple[int, int]]): (dx, dy) steps to read along
 
-    hits = reduce_grid(grid)
+    Yields:
+        Tuple[int, int, int, int]: x, y of the first letter and the direction
+    """
+    needle = word.encode()
 
-    return hits
+    for dx, dy in directions:
+        for x, y, line in scan_lines(grid, dx, dy):
+            i = line.find(needle)
+            while i >= 0:
+                yield (x + i * dx, y + i * dy, dx, dy)
+                i = line.find(needle, i + 1)
+
+
+def count_word(
+    grid: Grid, word: str, directions: Iterable[Tuple[int, int]] = ALL_DIRECTIONS
+) -> int:
+    return sum(1 for _ in find_word(grid, word, directions))
+
+
+def count_crosses(grid: Grid, word: str) -> int:
+    """Count the crosses made of two diagonal occurrences of a word.
+
+    Both diagonals of a cross share their middle letter, so the crosses are
+    the centers hit by an occurrence along each of the two diagonal lines.
+
+    Args:
+        grid (Grid): grid to search
+        word (str): word of odd length, ex: "MAS"
 
+    Returns:
+        int: number of crosses
+    """
+    if len(word) % 2 == 0:
+        raise ValueError(f"{word} has no middle letter")
+
+    middle = len(word) // 2
+
+    # dx * dy tells the two diagonal lines apart, whatever the reading direction
+    hits = {
+        ((x + middle * dx, y + middle * dy), dx * dy)
+        for x, y, dx, dy in find_word(grid, word, DIAGONALS)
+    }
+    centers = Counter(center for center, _ in hits)
+
+    return sum(1 for lines in centers.values() if lines == 2)
+
+
+def solve_part1(source: str | list[str] = "input/day04/part1.txt") -> int:
+    grid = Grid.from_source(source)
+
+    hits = count_word(grid, "XMAS")
+
+    return hits
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day04/example.txt")
-    lines = read_lines("input/day04/part1.txt")
-    grid = parse_xmas_grid(lines)
 
-    # for row in grid:
-    #     print(row)
+def solve_part2(source: str | list[str] = "input/day04/part1.txt") -> int:
+    grid = Grid.from_source(source)
 
-    hits = reduce_grid2(grid)
+    hits = count_crosses(grid, "MAS")
 
     return hits
@@ -1,16 +1,21 @@
-from typing import Tuple
-from src.common.file_utils import read_lines
+import heapq
+from typing import NamedTuple, Tuple
+from src.common.file_utils import read_input
 import re
-from pydantic import BaseModel
 
+NO_PAGES: frozenset[int] = frozenset()
 
-class PageOrderingRule(BaseModel):
+
+class PageOrderingRule(NamedTuple):
     before: int
     after: int
 
 
-class SafetyManualUpdate(BaseModel):
-    pages: list[int]
+class SafetyManualUpdate:
+    __slots__ = ("pages",)
+
+    def __init__(self, pages: list[int]):
+        self.pages = pages
 
     def get_middle_page(self) -> int:
         return self.pages[len(self.pages) // 2]
@@ -18,54 +23,64 @@ class SafetyManualUpdate(BaseModel):
 
 class SafetyManualValidator:
     def __init__(self):
-        self.rules: list[PageOrderingRule] = []
+        # page -> pages that must be printed after it
+        self.successors: dict[int, set[int]] = {}
 
     def add_rule(self, rule: PageOrderingRule):
-        self.rules.append(rule)
+        self.successors.setdefault(rule.before, set()).add(rule.after)
 
     def validate(self, manual: SafetyManualUpdate) -> bool:
-        for rule in self.rules:
-            if rule.before not in manual.pages or rule.after not in manual.pages:
-                # this rule does not apply
-                continue
-
-            # test rule
-            before_index = manual.pages.index(rule.before)
-            after_index = manual.pages.index(rule.after)
-
-            if before_index > after_index:
+        # a page is misplaced if one of its successors was already printed
+        printed: set[int] = set()
+        for page in manual.pages:
+            if not self.successors.get(page, NO_PAGES).isdisjoint(printed):
                 return False
 
+            printed.add(page)
+
         return True
 
     def fix_manual(self, manual: SafetyManualUpdate) -> SafetyManualUpdate:
-        rules_of_interest = [
-            r
-            for r in self.rules
-            if r.before in manual.pages and r.after in manual.pages
-        ]
+        """Reorder the pages of a manual to follow the rules, in one pass.
+
+        Topological sort (Kahn) of the rules restricted to the pages of the
+        manual. Pages left unconstrained keep their relative order.
+
+        Args:
+            manual (SafetyManualUpdate): manual to fix, left unchanged
+
+        Returns:
+            SafetyManualUpdate: manual with its pages reordered
+        """
+        pages = manual.pages
+        in_manual = set(pages)
+
+        successors = {
+            page: self.successors.get(page, NO_PAGES) & in_manual for page in pages
+        }
 
-        manual = self.swap_pages(manual, rules_of_interest)
-        while not self.validate(manual):
-            manual = self.swap_pages(manual, rules_of_interest)
+        predecessors_left = dict.fromkeys(pages, 0)
+        for page in pages:
+            for after in successors[page]:
+                predecessors_left[after] += 1
 
-        return manual
+        # a page is ready once its predecessors are placed, earliest in the manual first
+        position = {page: i for i, page in enumerate(pages)}
+        ready = [position[page] for page in pages if predecessors_left[page] == 0]
+        order: list[int] = []
+        while ready:
+            page = pages[heapq.heappop(ready)]
+            order.append(page)
 
-    def swap_pages(
-        self, manual: SafetyManualUpdate, rules: list[PageOrderingRule]
-    ) -> SafetyManualUpdate:
-        for rule in rules:
-            before_index = manual.pages.index(rule.before)
-            after_index = manual.pages.index(rule.after)
+            for after in successors[page]:
+                predecessors_left[after] -= 1
+                if predecessors_left[after] == 0:
+                    heapq.heappush(ready, position[after])
 
-            if before_index > after_index:
-                # swap
-                manual.pages[before_index], manual.pages[after_index] = (
-                    manual.pages[after_index],
-                    manual.pages[before_index],
-                )
+        if len(order) != len(pages):
+            raise ValueError("Cyclic page ordering rules")
 
-        return manual
+        return SafetyManualUpdate(pages=order)
 
 
 def parse_input(
@@ -93,9 +108,8 @@ def parse_input(
     return (validator, manuals)
 
 
-def solve_part1() -> int:
-    # lines = read_lines("input/day05/example.txt")
-    lines = read_lines("input/day05/part1.txt")
+def solve_part1(source: str | list[str] = "input/day05/part1.txt") -> int:
+    lines = read_input(source)
 
     validator, manuals = parse_input(lines)
 
@@ -109,9 +123,8 @@ def solve_part1() -> int:
     return total
 
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day05/example.txt")
-    lines = read_lines("input/day05/part1.txt")
+def solve_part2(source: str | list[str] = "input/day05/part1.txt") -> int:
+    lines = read_input(source)
 
     validator, manuals = parse_input(lines)
     invalid_manuals = [m for m in manuals if not validator.validate(m)]
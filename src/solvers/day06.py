@@ -1,35 +1,24 @@
-from typing import Tuple
-from src.common.file_utils import read_lines
-import re
-from pydantic import BaseModel
+from array import array
+from typing import Sequence, Tuple
+from src.common.grid import Grid
 
 
-def load_floor_plan(lines: list[str]) -> list[list[str]]:
-    floor_plan = []
+def find_starting_position(floor_plan: Grid) -> Tuple[int, int]:
+    start = floor_plan.find("^")
+    if start is None:
+        raise ValueError("No starting position found")
 
-    for line in lines:
-        if len(line) == 0:
-            continue
+    return start
 
-        floor_plan.append([c for c in line[:-1]])
 
-    return floor_plan
+class GuardState:
+    __slots__ = ("x", "y", "orientation")
 
-
-def find_starting_position(floor_plan: list[list[str]]) -> Tuple[int, int]:
-    for y in range(len(floor_plan)):
-        for x in range(len(floor_plan[y])):
-            if floor_plan[y][x] == "^":
-                return (x, y)
-
-    raise ValueError("No starting position found")
-
-
-class GuardState(BaseModel):
-    x: int
-    y: int
-    # 0 = up, 1 = right, 2 = down, 3 = left
-    orientation: int
+    def __init__(self, x: int, y: int, orientation: int):
+        self.x = x
+        self.y = y
+        # 0 = up, 1 = right, 2 = down, 3 = left
+        self.orientation = orientation
 
     def turn_right(self):
         self.orientation = (self.orientation + 1) % 4
@@ -44,18 +33,28 @@ class GuardState(BaseModel):
         elif self.orientation == 3:
             return (self.x - 1, self.y)
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GuardState):
+            return NotImplemented
+
+        return (self.x, self.y, self.orientation) == (
+            other.x,
+            other.y,
+            other.orientation,
+        )
+
     def __hash__(self) -> int:
         return hash((self.x, self.y, self.orientation))
 
 
 class GuardSimulationPart1:
 
-    def __init__(self, floor_plan: list[list[str]], guard: GuardState):
+    def __init__(self, floor_plan: Grid, guard: GuardState):
         self.floor_plan = floor_plan
         self.guard = guard
 
-        self.max_x = len(floor_plan[0])
-        self.max_y = len(floor_plan)
+        self.max_x = floor_plan.width
+        self.max_y = floor_plan.height
 
         self.visited = [[0] * self.max_x for i in range(self.max_y)]
         self.visited[guard.y][guard.x] = 1
@@ -68,7 +67,7 @@ class GuardSimulationPart1:
 
             return False
 
-        if self.floor_plan[next_y][next_x] == "#":
+        if self.floor_plan[next_x, next_y] == "#":
             # obstacle ahead : turn right without moving
             self.guard.orientation = (self.guard.orientation + 1) % 4
             return True
@@ -95,94 +94,263 @@ class GuardSimulationPart1:
         return total
 
 
+# (dx, dy) of each orientation, 0 = up, 1 = right, 2 = down, 3 = left
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+# jump table entry of a guard walking off the map
+EXIT = -1
+
+
+def build_jump_table(floor_plan: Grid) -> list[array]:
+    """Precompute where the guard stops when walking from any cell.
+
+    Cells are flat indexes (y * width + x). For every orientation, the table
+    holds the cell right before the next wall ahead, or EXIT if the guard
+    walks off the map. Each line is scanned once, from the edge the guard
+    walks toward, so building the table is O(cells).
+
+    Args:
+        floor_plan (Grid): map of the lab
+
+    Returns:
+        list[array]: one table of cell indexes per orientation
+    """
+    width = floor_plan.width
+    height = floor_plan.height
+    wall = ord("#")
+
+    table = []
+    for dx, dy in DIRECTIONS:
+        jumps = array("i", [EXIT]) * (width * height)
+        step = dy * width + dx
+
+        if dx == 0:
+            ys = range(height) if dy < 0 else range(height - 1, -1, -1)
+            lines = [[(x, y) for y in ys] for x in range(width)]
+        else:
+            xs = range(width) if dx < 0 else range(width - 1, -1, -1)
+            lines = [[(x, y) for x in xs] for y in range(height)]
+
+        for line in lines:
+            stop = EXIT
+            for x, y in line:
+                cell = y * width + x
+                if floor_plan.byte(x, y) == wall:
+                    stop = cell - step
+                else:
+                    jumps[cell] = stop
+
+        table.append(jumps)
+
+    return table
+
+
+class LoopDetector:
+    """Loop check of a guard jumping from wall to wall.
+
+    Only reads the jump table, which can live in shared memory, so detectors
+    in several processes can test candidates side by side.
+    """
+
+    def __init__(self, jumps: Sequence[Sequence[int]], width: int):
+        self.jumps = jumps
+        self.width = width
+
+        # one bit per orientation, for the cells where the guard turned
+        self.turns = bytearray(len(jumps[0]))
+
+    def loops_with_obstacle(
+        self, obstacle: Tuple[int, int], cell: int, orientation: int
+    ) -> bool:
+        """Test if an extra obstacle traps the guard in a loop.
+
+        The guard jumps from wall to wall with the jump table, only the row
+        and the column of the extra obstacle need a check on each jump.
+
+        Args:
+            obstacle (Tuple[int, int]): x, y of the extra obstacle
+            cell (int): flat index of the guard
+            orientation (int): orientation of the guard
+
+        Returns:
+            bool: True if the guard never leaves the map
+        """
+        width = self.width
+        ox, oy = obstacle
+        blocked = oy * width + ox
+
+        turns = self.turns
+        turned: list[int] = []
+        loop = False
+
+        while True:
+            stop = self.jumps[orientation][cell]
+            y, x = divmod(cell, width)
+
+            # the extra obstacle stops the guard first if it is on the way
+            if orientation == 0:
+                if x == ox and y > oy and (stop == EXIT or oy >= stop // width):
+                    stop = blocked + width
+            elif orientation == 1:
+                if y == oy and x < ox and (stop == EXIT or ox <= stop % width):
+                    stop = blocked - 1
+            elif orientation == 2:
+                if x == ox and y < oy and (stop == EXIT or oy <= stop // width):
+                    stop = blocked - width
+            elif y == oy and x > ox and (stop == EXIT or ox >= stop % width):
+                stop = blocked + 1
+
+            if stop == EXIT:
+                break
+
+            bit = 1 << orientation
+            if turns[stop] & bit:
+                # already turned here, facing the same way
+                loop = True
+                break
+
+            turns[stop] |= bit
+            turned.append(stop)
+
+            cell = stop
+            orientation = (orientation + 1) % 4
+
+        for cell in turned:
+            turns[cell] = 0
+
+        return loop
+
+
 class GuardSimulationPart2:
 
-    def __init__(self, floor_plan: list[list[str]], guard: GuardState):
+    def __init__(self, floor_plan: Grid, guard: GuardState):
         self.floor_plan = floor_plan
         self.guard = guard
-        self.max_x = len(floor_plan[0])
-        self.max_y = len(floor_plan)
+        self.max_x = floor_plan.width
+        self.max_y = floor_plan.height
 
-    def simulate(self) -> int:
-        original_position = (self.guard.x, self.guard.y)
+        self.detector = LoopDetector(build_jump_table(floor_plan), self.max_x)
+
+    def first_visits(self) -> list[Tuple[Tuple[int, int], int, int]]:
+        """Walk the original path, noting how each cell is first entered.
+
+        Returns:
+            list[Tuple[Tuple[int, int], int, int]]: every cell of the path but
+                the start, with the guard cell and orientation right before it
+        """
         guard = GuardState(
             x=self.guard.x, y=self.guard.y, orientation=self.guard.orientation
         )
 
-        looping_obstacle_locations: set[Tuple[int, int]] = set()
+        seen = {(guard.x, guard.y)}
+        visits = []
         while True:
-
             next_x, next_y = guard.ahead()
             if not (self.max_x > next_x >= 0 and self.max_y > next_y >= 0):
                 # exiting the map
                 break
 
-            if self.floor_plan[next_y][next_x] == "#":
+            if self.floor_plan[next_x, next_y] == "#":
                 # obstacle ahead : turn right without moving
                 guard.turn_right()
                 continue
 
-            # test if placing an obstacle here will cause a loop
-            if ((next_x, next_y) not in looping_obstacle_locations) and (
-                next_x,
-                next_y,
-            ) != original_position:
-
-                visited_loop: set[GuardState] = set()
-                guard_loop = GuardState(
-                    x=self.guard.x, y=self.guard.y, orientation=self.guard.orientation
-                )
-                visited_loop.add(
-                    GuardState(
-                        x=guard_loop.x,
-                        y=guard_loop.y,
-                        orientation=guard_loop.orientation,
+            if (next_x, next_y) not in seen:
+                seen.add((next_x, next_y))
+                visits.append(
+                    (
+                        (next_x, next_y),
+                        guard.y * self.max_x + guard.x,
+                        guard.orientation,
                     )
                 )
 
-                while True:
-                    loop_x, loop_y = guard_loop.ahead()
-
-                    if not (self.max_x > loop_x >= 0 and self.max_y > loop_y >= 0):
-                        # exiting the map : no loop
-                        break
-
-                    if (loop_x, loop_y) == (next_x, next_y) or self.floor_plan[loop_y][
-                        loop_x
-                    ] == "#":
-                        # obstacle ahead : turn right without moving
-                        guard_loop.turn_right()
-                        continue
-
-                    # keep moving
-                    guard_loop.x = loop_x
-                    guard_loop.y = loop_y
-
-                    if guard_loop in visited_loop:
-                        # loop detected
-                        looping_obstacle_locations.add((next_x, next_y))
-                        # print(f"Looping obstacle at {next_x},{next_y} detected, loop length = {len(visited_loop)}")
-                        break
-
-                    visited_loop.add(
-                        GuardState(
-                            x=guard_loop.x,
-                            y=guard_loop.y,
-                            orientation=guard_loop.orientation,
-                        )
-                    )
-
-            # move forward along the original path
             guard.x = next_x
             guard.y = next_y
 
-        return len(looping_obstacle_locations)
+        return visits
+
+    def simulate(self, max_workers: int | None = 1) -> int:
+        # the path up to the first visit of a cell does not change when an
+        # obstacle is placed there, the guard is only simulated from that point
+        visits = self.first_visits()
+
+        if max_workers == 1:
+            return sum(
+                1 for visit in visits if self.detector.loops_with_obstacle(*visit)
+            )
+
+        return self.simulate_parallel(visits, max_workers)
+
+    def simulate_parallel(
+        self, visits: list[Tuple[Tuple[int, int], int, int]], max_workers: int | None
+    ) -> int:
+        """Test the candidate obstacles across a process pool.
+
+        The jump table is copied once into shared memory, which every worker
+        maps at startup, so the tasks only carry their candidates.
+
+        Args:
+            visits (list[Tuple[Tuple[int, int], int, int]]): candidates, see
+                first_visits
+            max_workers (int | None): pool size, defaults to the cpu count
+
+        Returns:
+            int: number of candidates trapping the guard in a loop
+        """
+        # deferred, only the parallel mode needs the process pool
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing.shared_memory import SharedMemory
+
+        cells = self.max_x * self.max_y
+        table = b"".join(jumps.tobytes() for jumps in self.detector.jumps)
+
+        shared = SharedMemory(create=True, size=len(table))
+        try:
+            shared.buf[: len(table)] = table
+
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_jump_table,
+                initargs=(shared.name, self.max_x, cells),
+            ) as executor:
+                loops = executor.map(
+                    _loops_with_obstacle,
+                    visits,
+                    chunksize=max(1, len(visits) // (workers * 4)),
+                )
+                return sum(loops)
+        finally:
+            shared.close()
+            shared.unlink()
+
+
+# detector of a pool worker, over the shared jump table
+_worker_detector: LoopDetector | None = None
+_worker_memory = None
+
+
+def _attach_jump_table(name: str, width: int, cells: int):
+    from multiprocessing.shared_memory import SharedMemory
 
+    global _worker_detector, _worker_memory
 
-def solve_part1() -> int:
-    # lines = read_lines("input/day06/example.txt")
-    lines = read_lines("input/day06/part1.txt")
-    floor_plan = load_floor_plan(lines)
+    # the mapping must stay open as long as the worker runs
+    _worker_memory = SharedMemory(name=name)
+    table = _worker_memory.buf.cast("i")
+    jumps = [table[i * cells : (i + 1) * cells] for i in range(len(DIRECTIONS))]
+
+    _worker_detector = LoopDetector(jumps, width)
+
+
+def _loops_with_obstacle(visit: Tuple[Tuple[int, int], int, int]) -> bool:
+    return _worker_detector.loops_with_obstacle(*visit)
+
+
+def solve_part1(source: str | list[str] = "input/day06/part1.txt") -> int:
+    floor_plan = Grid.from_source(source)
 
     start_x, start_y = find_starting_position(floor_plan)
 
@@ -192,14 +360,13 @@ def solve_part1() -> int:
     return simulation.simulate()
 
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day06/example.txt")
-    lines = read_lines("input/day06/part1.txt")
-
-    floor_plan = load_floor_plan(lines)
+def solve_part2(
+    source: str | list[str] = "input/day06/part1.txt", max_workers: int | None = 1
+) -> int:
+    floor_plan = Grid.from_source(source)
     start_x, start_y = find_starting_position(floor_plan)
 
     guard = GuardState(x=start_x, y=start_y, orientation=0)
     simulation = GuardSimulationPart2(floor_plan, guard)
 
-    return simulation.simulate()
+    return simulation.simulate(max_workers)
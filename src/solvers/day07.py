@@ -1,9 +1,20 @@
-from enum import Enum
-from typing import Tuple
-from src.common.file_utils import read_lines
+import atexit
+import os
+import sys
+import time
+from itertools import repeat
+from typing import NamedTuple
+from src.common.cache import cached_parse
 import re
-from pydantic import BaseModel
-import concurrent.futures
+
+
+def next_power_of_ten(n: int) -> int:
+    # smallest power of ten above n, the shift of a concatenation with n
+    power = 10
+    while power <= n:
+        power *= 10
+
+    return power
 
 
 class Equation:
@@ -12,106 +23,161 @@ class Equation:
         raw_numbers = re.findall(r"\d+", equation)
         self.answer = int(raw_numbers[0])
         self.numbers = [int(n) for n in raw_numbers[1:]]
+        self.shifts = [next_power_of_ten(n) for n in self.numbers]
 
-    def try_solve_part_1(self) -> bool:
-        # guide a brute force solution by ensuring that the calculation space number is never higher than the answer
-        # since we only add or multiply , the equation is a monotonic increasing function
+    def is_solvable(self, concatenation: bool) -> bool:
+        """Search the operators backwards, from the answer to the first number.
 
-        # solutions will be represented as a bitwize number with 0 being 'add' and '1' being multiply
-        op_count = len(self.numbers) - 1
-        num_solution = 2**op_count
+        Undoing the last operator leaves the value of the shorter equation:
+        subtract for +, divide for * only if exact, strip the digits for ||
+        only if they match. Every failed test prunes a whole branch, instead
+        of enumerating the 2^n or 3^n operator combinations.
 
-        for i in range(num_solution):
+        Args:
+            concatenation (bool): allow the || operator (part 2)
 
-            current = self.numbers[0]
+        Returns:
+            bool: True if some combination of operators gives the answer
+        """
+        numbers = self.numbers
 
-            for j in range(op_count):
-                if i & (1 << j):
-                    current *= self.numbers[j + 1]
-                else:
-                    current += self.numbers[j + 1]
+        # (value of the equation up to numbers[i], i)
+        stack = [(self.answer, len(numbers) - 1)]
+        while stack:
+            target, i = stack.pop()
+            n = numbers[i]
 
-                if current > self.answer:
-                    break
+            if i == 0:
+                if target == n:
+                    return True
+                continue
 
-            if current == self.answer:
-                return True
+            if concatenation and target % self.shifts[i] == n:
+                stack.append((target // self.shifts[i], i - 1))
+
+            if n == 0:
+                # any prefix times 0 is 0, whatever the operators before it
+                if target == 0:
+                    return True
+            elif target % n == 0:
+                stack.append((target // n, i - 1))
+
+            if target >= n:
+                stack.append((target - n, i - 1))
 
         return False
 
+    def try_solve_part_1(self) -> bool:
+        return self.is_solvable(concatenation=False)
+
     def try_solve_part_2(self) -> bool:
-        # no point in solving for || operator if part 1 already produced a solution
-        # part 1 being very fast, we can afford to do this check
-        if self.try_solve_part_1():
-            return True
-
-        # same as part 1 , but now with 3 operators (modulo instead of bitwize):  0 = add, 1 = multiply, 2 = aggregate
-        op_count = len(self.numbers) - 1
-        num_solution = 3**op_count
-
-        # start from 2 since we already tried part 1 (0 and 1 are already covered)
-        # we could probably cull even more solutions by checking if the aggregate operator is used
-        #  at least once but this is good enough for my cpu. (Ryzen 5800x)
-        for i in range(2, num_solution):
-            current = self.numbers[0]
-            remaining_operators = i
-
-            for j in range(op_count):
-                cur_op = remaining_operators % 3
-                remaining_operators = remaining_operators // 3
-
-                if cur_op == 0:
-                    current += self.numbers[j + 1]
-                elif cur_op == 1:
-                    current *= self.numbers[j + 1]
-                else:
-                    # aggregate
-                    current = int(f"{current}{self.numbers[j+1]}")
-
-                if current > self.answer:
-                    break
-
-            if current == self.answer:
-                return True
+        return self.is_solvable(concatenation=True)
 
-        return False
 
+def parse_input(lines: list[str]) -> list[Equation]:
+    return [Equation(line) for line in lines if len(line.strip()) > 0]
 
-def solve_part1() -> int:
-    # lines = read_lines("input/day07/example.txt")
-    lines = read_lines("input/day07/part1.txt")
 
-    total = 0
+# chunks per worker, so that a slow chunk does not hold back the whole batch
+CHUNKS_PER_WORKER = 4
+
+
+class ChunkResult(NamedTuple):
+    total: int
+    size: int
+    elapsed: float
 
-    for line in lines:
-        if len(line) == 0:
-            continue
 
-        equation = Equation(line)
-        if equation.try_solve_part_1():
+def solve_chunk(equations: list[Equation], concatenation: bool) -> ChunkResult:
+    start = time.perf_counter()
+
+    total = 0
+    for equation in equations:
+        if equation.is_solvable(concatenation):
             total += equation.answer
 
-    return total
+    return ChunkResult(total, len(equations), time.perf_counter() - start)
 
 
-def solve_line(line: str) -> int:
-    if len(line) == 0:
-        return 0
+# process pool kept alive across both parts
+_pool = None
+_pool_workers = 0
 
-    equation = Equation(line)
-    if equation.try_solve_part_2():
-        return equation.answer
 
-    return 0
+def get_pool(workers: int):
+    # deferred, the process pool machinery is slow to import
+    from concurrent.futures import ProcessPoolExecutor
 
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+            atexit.unregister(_pool.shutdown)
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day07/example.txt")
-    lines = read_lines("input/day07/part1.txt")
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+        atexit.register(_pool.shutdown)
 
-    total = 0
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        for line_total in zip(lines, executor.map(solve_line, lines)):
-            total += line_total[1]
+    return _pool
+
+
+def solve_equations(
+    equations: list[Equation],
+    concatenation: bool,
+    max_workers: int | None = None,
+    verbose: bool = False,
+) -> int:
+    """Sum the answers of the solvable equations, in contiguous chunks.
+
+    The equations are split into a few chunks per worker and every chunk is a
+    single task, so the pool exchanges a handful of messages instead of one
+    per equation. With a single worker, the chunks run in this process.
+
+    Args:
+        equations (list[Equation]): parsed equations
+        concatenation (bool): allow the || operator (part 2)
+        max_workers (int | None): pool size, defaults to the cpu count
+        verbose (bool): report the time of every chunk on stderr
+
+    Returns:
+        int: total calibration result
+    """
+    workers = max_workers or os.cpu_count() or 1
+
+    size = max(1, -(-len(equations) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [equations[i : i + size] for i in range(0, len(equations), size)]
+
+    if workers == 1:
+        results = [solve_chunk(chunk, concatenation) for chunk in chunks]
+    else:
+        pool = get_pool(workers)
+        results = list(pool.map(solve_chunk, chunks, repeat(concatenation)))
+
+    if verbose:
+        for i, result in enumerate(results):
+            print(
+                f"chunk {i}: {result.size} equations in {result.elapsed * 1000:.2f}ms",
+                file=sys.stderr,
+            )
+
+    return sum(result.total for result in results)
+
+
+def solve_part1(
+    source: str | list[str] = "input/day07/part1.txt",
+    max_workers: int | None = None,
+    verbose: bool = False,
+) -> int:
+    equations = cached_parse(source, parse_input)
+
+    return solve_equations(equations, False, max_workers, verbose)
+
+
+def solve_part2(
+    source: str | list[str] = "input/day07/part1.txt",
+    max_workers: int | None = None,
+    verbose: bool = False,
+) -> int:
+    equations = cached_parse(source, parse_input)
 
-    return total
+    return solve_equations(equations, True, max_workers, verbose)
@@ -1,108 +1,121 @@
-from enum import Enum
-from typing import Tuple
-from src.common.file_utils import read_lines
+from math import gcd
 import re
-from pydantic import BaseModel
-import concurrent.futures
+import sys
+from src.common.grid import Grid
 
+# any cell holding an antenna
+ANTENNA = re.compile(rb"[^.\r\n]")
 
-def parse_antinode_map(lines: list[str]) -> list[list[chr]]:
-    antinode_map = []
-    for line in lines:
-        nodes = [c for c in line[:-1]]
-        if len(nodes) == 0:
-            continue
 
-        antinode_map.append(nodes)
-    return antinode_map
+def group_antennas(antenna_map: Grid) -> dict[int, list[tuple[int, int]]]:
+    # single scan of the raw map bytes, antennas grouped by frequency
+    antennas: dict[int, list[tuple[int, int]]] = {}
+    for match in ANTENNA.finditer(antenna_map.data):
+        y, x = divmod(match.start(), antenna_map.stride)
+        antennas.setdefault(antenna_map.data[match.start()], []).append((x, y))
 
+    return antennas
 
-def compute_signal(
-    antinode_map: list[list[chr]], consider_harmonics: bool = False
-) -> dict[chr, set]:
 
-    max_x = len(antinode_map[0])
-    max_y = len(antinode_map)
+def _harmonic_range(position: int, step: int, size: int) -> range:
+    # values of k keeping position + k * step inside [0, size)
+    if step > 0:
+        return range(-(position // step), (size - 1 - position) // step + 1)
+    if step < 0:
+        return range(-((size - 1 - position) // -step), position // -step + 1)
 
-    signals_maps: dict[chr, set] = {}
-    node_positions: dict[chr, list[tuple[int, int]]] = {}
+    # no constraint along this axis
+    return range(-sys.maxsize, sys.maxsize)
 
-    for y in range(max_y):
-        for x in range(max_x):
 
-            if antinode_map[y][x] == ".":
-                continue
+def mark_line(
+    occupancy: bytearray,
+    antenna_map: Grid,
+    x: int,
+    y: int,
+    step_x: int,
+    step_y: int,
+):
+    """Mark every cell of the map on the line through (x, y) along a step.
 
-            node_type = antinode_map[y][x]
-            node_pos = (x, y)
+    The cells are found in closed form: the range of harmonics k is clipped to
+    the map bounds, then the cells, evenly spaced in the flat occupancy grid,
+    are written with a single slice assignment.
+    """
+    width = antenna_map.width
+    k_x = _harmonic_range(x, step_x, width)
+    k_y = _harmonic_range(y, step_y, antenna_map.height)
 
-            node_positions.setdefault(node_type, [])
-            node_positions[node_type].append(node_pos)
+    first = max(k_x.start, k_y.start)
+    last = min(k_x.stop, k_y.stop) - 1
+    if first > last:
+        return
 
-            signals_maps.setdefault(node_type, set())
+    flat_step = step_y * width + step_x
+    start = (y + first * step_y) * width + x + first * step_x
+    stop = (y + last * step_y) * width + x + last * step_x
 
-            if consider_harmonics:
-                signals_maps[node_type].add(node_pos)
+    if flat_step < 0:
+        start, stop, flat_step = stop, start, -flat_step
 
-    for node_type in node_positions:
-        for i in range(len(node_positions[node_type])):
-            for j in range(len(node_positions[node_type])):
-                if i == j:
-                    continue
-
-                x1, y1 = node_positions[node_type][i]
-                x2, y2 = node_positions[node_type][j]
-
-                dist_x = x2 - x1
-                dist_y = y2 - y1
-
-                harmonic_index = 1
-                while True:
+    occupancy[start : stop + 1 : flat_step] = b"\x01" * (last - first + 1)
 
-                    echo_x = x1 - (dist_x * harmonic_index)
-                    echo_y = y1 - (dist_y * harmonic_index)
 
-                    if not (0 <= echo_x < max_x and 0 <= echo_y < max_y):
-                        break
+def compute_signal(antenna_map: Grid, consider_harmonics: bool = False) -> bytearray:
+    """Find the antinodes of every pair of antennas sharing a frequency.
 
-                    if antinode_map[echo_y][echo_x] == node_type:
-                        continue
+    Without harmonics, a pair has two antinodes, one on each side at the
+    distance between the antennas. With harmonics, every cell in line with
+    the pair is an antinode: the step is the distance reduced by its gcd.
 
-                    signals_maps[node_type].add((echo_x, echo_y))
+    Args:
+        antenna_map (Grid): map of the antennas
+        consider_harmonics (bool): part 2 rules
 
-                    if not consider_harmonics:
-                        break
-
-                    harmonic_index += 1
-
-    return signals_maps
+    Returns:
+        bytearray: flat occupancy grid (y * width + x), 1 on antinodes
+    """
+    width = antenna_map.width
+    height = antenna_map.height
+    occupancy = bytearray(width * height)
 
+    for positions in group_antennas(antenna_map).values():
+        for i, (x1, y1) in enumerate(positions):
+            for x2, y2 in positions[i + 1 :]:
+                dist_x = x2 - x1
+                dist_y = y2 - y1
 
-def solve_part1() -> int:
-    # lines = read_lines("input/day08/example.txt")
-    lines = read_lines("input/day08/part1.txt")
+                if consider_harmonics:
+                    divisor = gcd(dist_x, dist_y)
+                    mark_line(
+                        occupancy,
+                        antenna_map,
+                        x1,
+                        y1,
+                        dist_x // divisor,
+                        dist_y // divisor,
+                    )
+                    continue
 
-    antinode_map = parse_antinode_map(lines)
-    signals_maps = compute_signal(antinode_map)
+                for echo_x, echo_y in (
+                    (x1 - dist_x, y1 - dist_y),
+                    (x2 + dist_x, y2 + dist_y),
+                ):
+                    if 0 <= echo_x < width and 0 <= echo_y < height:
+                        occupancy[echo_y * width + echo_x] = 1
 
-    unique_positions = set()
-    for node_type in signals_maps:
-        echos = signals_maps[node_type]
-        unique_positions.update(echos)
+    return occupancy
 
-    return len(unique_positions)
 
+def solve_part1(source: str | list[str] = "input/day08/part1.txt") -> int:
+    antenna_map = Grid.from_source(source)
+    occupancy = compute_signal(antenna_map)
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day08/example.txt")
-    lines = read_lines("input/day08/part1.txt")
+    return occupancy.count(1)
 
-    antinode_map = parse_antinode_map(lines)
-    signals_maps = compute_signal(antinode_map, consider_harmonics=True)
 
-    unique_positions = set()
-    for node_type in signals_maps:
-        echos = signals_maps[node_type]
-        unique_positions.update(echos)
+def solve_part2(source: str | list[str] = "input/day08/part1.txt") -> int:
+    antenna_map = Grid.from_source(source)
+    occupancy = compute_signal(antenna_map, consider_harmonics=True)
 
-    return len(unique_positions)
+    return occupancy.count(1)
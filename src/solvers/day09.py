@@ -1,204 +1,199 @@
-from enum import Enum
-from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
+from array import array
+from itertools import accumulate
+import heapq
+from src.common.file_utils import read_input
 import re
-from pydantic import BaseModel
-import concurrent.futures
 
+# block map entry of a free block
+FREE = -1
 
-class FileSegment(BaseModel):
-    position: int
-    size: int
-    file_id: int
+
+def span_checksum(file_id: int, start: int, size: int) -> int:
+    # file_id * (start + start + 1 + ... + start + size - 1), in closed form
+    return file_id * (size * start + size * (size - 1) // 2)
 
 
 class DiskFileSystem:
     def __init__(self):
-        self.files: dict[int, list[FileSegment]] = {}
+        # files and free spans as parallel arrays, in disk order
+        self.file_ids = array("i")
+        self.file_starts = array("q")
+        self.file_sizes = array("i")
+        self.free_starts = array("q")
+        self.free_sizes = array("i")
         self.disk_size = 0
 
     def parse_input(self, input: str):
-        pos = 0
-        file_id = 0
-
         numbers = [int(n) for n in re.findall(r"\d", input)]
 
-        for i in range(0, len(numbers)):
-            if i % 2 == 0:
-                # new file
-                self.files.setdefault(file_id, [])
-                self.files[file_id].append(
-                    FileSegment(position=pos, size=numbers[i], file_id=file_id)
-                )
+        # files on the even digits, free spans on the odd ones
+        positions = list(accumulate(numbers, initial=0))
 
-                pos += numbers[i]
-                file_id += 1
-            else:
-                # free space
-                pos += numbers[i]
+        self.file_sizes = array("i", numbers[0::2])
+        self.file_starts = array("q", positions[0:-1:2])
+        self.file_ids = array("i", range(len(self.file_sizes)))
+        self.disk_size = positions[-1]
 
-        max_file_id = max(self.files.keys())
-        self.disk_size = max([s.position + s.size for s in self.files[max_file_id]])
+        # spans only separated by empty files are a single span
+        self.free_starts = array("q")
+        self.free_sizes = array("i")
+        for start, size in zip(positions[1:-1:2], numbers[1::2]):
+            if self.free_sizes and self.free_starts[-1] + self.free_sizes[-1] == start:
+                self.free_sizes[-1] += size
+            else:
+                self.free_starts.append(start)
+                self.free_sizes.append(size)
 
-    def position_is_free(self, position: int):
-        for f in self.files:
-            for s in self.files[f]:
-                if s.position <= position < s.position + s.size:
-                    return False
+    def build_block_map(self) -> array:
+        # one entry per block : the id of the file stored there, or FREE
+        blocks = array("i", [FREE]) * self.disk_size
+        for file_id, start, size in zip(
+            self.file_ids, self.file_starts, self.file_sizes
+        ):
+            blocks[start : start + size] = array("i", [file_id]) * size
 
-        return True
+        return blocks
 
-    # def file_at_position(self,position:int):
-    #     for f in self.files:
-    #         for s in self.files[f]:
-    #             if s.position <= position < s.position + s.size:
-    #                 return s.file_id
+    def get_checksum(self, file_starts: array) -> int:
+        return sum(map(span_checksum, self.file_ids, file_starts, self.file_sizes))
 
-    #     return -1
+    def compress_with_fragmentation(self) -> int:
+        """Move file blocks one at a time to the leftmost free block.
 
-    def get_max_file_segment_block(self) -> int:
-        return max(s.size + s.position for f in self.files for s in self.files[f])
+        Two pointers walk the block map toward each other: the left one stops
+        on free blocks, the right one on file blocks, which are swapped until
+        the pointers meet. Every block is visited once.
 
-    def compress_file(self, file_id: int, start_at: int = 0) -> int:
+        Returns:
+            int: checksum of the compressed disk
+        """
+        blocks = self.build_block_map()
 
-        total_file_len = sum(s.size for s in self.files[file_id])
+        left = 0
+        right = len(blocks) - 1
+        while True:
+            while left < right and blocks[left] != FREE:
+                left += 1
 
-        absolute_max = self.get_max_file_segment_block()
+            while left < right and blocks[right] == FREE:
+                right -= 1
 
-        can_copy = False
-        i = start_at
-        while i < absolute_max:
-            if self.position_is_free(i):
-                # free space
-                if not can_copy:
-                    copy_start = i
-                can_copy = True
-                i += 1
+            if left >= right:
+                break
 
-            else:
-                # already a file here, copy if we can in the previous free space
-                if can_copy:
-                    can_copy = False
-                    free_space = i - copy_start
-
-                    while free_space > 0:
-                        if total_file_len <= free_space:
-                            # farthest segment only
-                            last_file_segment = max(
-                                self.files[file_id], key=lambda x: x.position
-                            )
-                            last_file_segment.position = copy_start
-                            return i - free_space
-
-                        else:
-                            # split the file and continue
-                            last_file_segment = max(
-                                self.files[file_id], key=lambda x: x.position
-                            )
-                            last_file_segment.size -= free_space
-                            last_file_segment.position += free_space
-                            total_file_len -= free_space
-                            self.files[file_id].append(
-                                FileSegment(
-                                    position=copy_start,
-                                    size=free_space,
-                                    file_id=file_id,
-                                )
-                            )
-                            free_space = 0
-                            copy_start += free_space
-                            i += free_space
-
-                else:
-                    i += 1
-        return i
-
-    def get_file_checksum(self, file_id: int) -> int:
-        checksum_positions = 0
-        for segments in self.files[file_id]:
-            for i in range(segments.size):
-                checksum_positions += segments.position + i
-
-        return checksum_positions * file_id
-
-    # def print_disk(self):
-    #     for i in range(self.disk_size):
-    #         file_id = self.file_at_position(i)
-    #         if file_id >= 0:
-    #             print(file_id,end="")
-    #         else:
-    #             print(".",end="")
-    #     print()
+            blocks[left] = blocks[right]
+            blocks[right] = FREE
 
-    def compress_with_fragmentation(self) -> int:
+        return sum(i * file_id for i, file_id in enumerate(blocks) if file_id > 0)
 
-        files = sorted(self.files.keys(), reverse=True)
-        checksum = 0
+    def compact(self) -> int:
+        """Move whole files, highest id first, to the leftmost span that fits.
+
+        Free spans are kept in one min-heap of positions per span size, so
+        the leftmost span fitting a file is the smallest head among the heaps
+        of its size and above. What is left of a span goes back to the heap of
+        its new size. Space freed by a file is never reused: only files with
+        a lower id, stored further left, are moved afterwards.
+
+        Returns:
+            int: checksum of the compacted disk
+        """
+        file_starts = array("q", self.file_starts)
+
+        # a single digit, unless spans were merged over empty files
+        max_span = max(self.free_sizes, default=0)
+
+        # spans are parsed in disk order, each list is already a heap
+        heaps: list[list[int]] = [[] for _ in range(max_span + 1)]
+        for start, size in zip(self.free_starts, self.free_sizes):
+            if size > 0:
+                heaps[size].append(start)
+
+        for i in reversed(range(len(file_starts))):
+            file_size = self.file_sizes[i]
+
+            best_size = 0
+            best_start = file_starts[i]
+            for size in range(max(file_size, 1), max_span + 1):
+                if heaps[size] and heaps[size][0] < best_start:
+                    best_size = size
+                    best_start = heaps[size][0]
+
+            if best_size == 0:
+                # no span on the left of the file
+                continue
 
-        last_processed = 0
-        for f in files:
-            max_segment = max(self.files[f], key=lambda x: x.position)
-            if max_segment.position + max_segment.size < last_processed:
-                file_checksum = self.get_file_checksum(f)
-                # print(f"File {f} cannot be compressed, checksum is {file_checksum}")
-                checksum += file_checksum
+            heapq.heappop(heaps[best_size])
+            file_starts[i] = best_start
 
-                # self.print_disk()
-                continue
+            if best_size > file_size:
+                heapq.heappush(heaps[best_size - file_size], best_start + file_size)
 
-            last_processed = self.compress_file(f, last_processed)
-            file_checksum = self.get_file_checksum(f)
-            # print(f"File {f} compressed, resuming at {last_processed}/{self.disk_size}, checksum is {file_checksum}")
-            checksum += file_checksum
-            # self.print_disk()
+        return self.get_checksum(file_starts)
 
-        return checksum
 
-    def compact(self) -> int:
-        files = sorted(self.files.keys(), reverse=True)
-        nb_files = len(files)
-        checksum = 0
+def fragmented_checksum(disk_map: str) -> int:
+    """Checksum of the block by block compression, streamed from the disk map.
 
-        # by definition, all files will only have one segment
+    Same two pointers as compress_with_fragmentation, but over the digits:
+    the left one walks files and free spans, the right one takes the blocks of
+    the last file to fill them. Each run of blocks is summed in closed form,
+    so no file list or block map is ever built.
 
-        for f in files:
-            f_pos = self.files[f][0].position
-            f_size = self.files[f][0].size
+    Args:
+        disk_map (str): digits of the disk map
 
-            sorted_files = sorted(
-                self.files.keys(), key=lambda x: self.files[x][0].position
-            )
+    Returns:
+        int: checksum of the compressed disk
+    """
+    digits = disk_map.encode()
+    zero = ord("0")
 
-            for i in range(1, nb_files):
+    # right is the last file, with its blocks not moved yet
+    right = (len(digits) - 1) // 2 * 2
+    remaining = digits[right] - zero
 
-                prev_file = sorted_files[i - 1]
-                next_file = sorted_files[i]
+    checksum = 0
+    position = 0
+    left = 0
+    while left < right:
+        size = digits[left] - zero
 
-                prev = self.files[prev_file][0].position + self.files[prev_file][0].size
+        if left % 2 == 0:
+            checksum += span_checksum(left // 2, position, size)
+            position += size
 
-                if f_pos < prev:
-                    break
+        else:
+            # fill the free span with the blocks of the last files
+            while size > 0 and left < right:
+                moved = min(size, remaining)
+                checksum += span_checksum(right // 2, position, moved)
+                position += moved
+                size -= moved
+                remaining -= moved
 
-                next = self.files[next_file][0].position
-                gap = next - prev
+                if remaining == 0:
+                    right -= 2
+                    remaining = digits[right] - zero
 
-                if f_size <= gap:
-                    self.files[f][0].position = prev
-                    # self.print_disk()
-                    break
+        left += 1
 
-            file_checksum = self.get_file_checksum(f)
-            checksum += file_checksum
+    if left == right:
+        # what is left of the file both pointers stopped on
+        checksum += span_checksum(right // 2, position, remaining)
 
-        return checksum
+    return checksum
 
 
-def solve_part1() -> int:
+def solve_part1(
+    source: str | list[str] = "input/day09/part1.txt", streaming: bool = False
+) -> int:
     # 6283404590840
 
-    # input = read_lines("input/day09/example.txt")[0][:-1]
-    input = read_lines("input/day09/part1.txt")[0][:-1]
+    input = read_input(source)[0].strip()
+
+    if streaming:
+        return fragmented_checksum(input)
 
     fs = DiskFileSystem()
     fs.parse_input(input)
@@ -207,11 +202,10 @@ def solve_part1() -> int:
     return checksum
 
 
-def solve_part2() -> int:
+def solve_part2(source: str | list[str] = "input/day09/part1.txt") -> int:
     # 6304576012713
 
-    # input = read_lines("input/day09/example.txt")[0][:-1]
-    input = read_lines("input/day09/part1.txt")[0][:-1]
+    input = read_input(source)[0].strip()
 
     fs = DiskFileSystem()
     fs.parse_input(input)
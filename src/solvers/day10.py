@@ -1,140 +1,69 @@
-from enum import Enum
-from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
-import re
-from pydantic import BaseModel
-import concurrent.futures
-
-
-def parse_map(input: list[str]) -> list[list[int]]:
-
-    trail_map = []
-
-    for line in input:
-        numbers = [int(n) for n in re.findall(r"\d", line)]
-        if len(numbers) > 0:
-            trail_map.append(numbers)
-
-    return trail_map
-
-
-def traverse_map(
-    x: int,
-    y: int,
-    x_size: int,
-    y_size: int,
-    trail_map: list[list[int]],
-    trail_heads: set[Tuple[int, int]],
-):
-
-    if x >= x_size or y >= y_size or x < 0 or y < 0:
-        return
-
-    current_height = trail_map[y][x]
-    if current_height == 9:
-        trail_heads.add((x, y))
-        return
-
-    # top
-    if y > 0 and trail_map[y - 1][x] == current_height + 1:
-        traverse_map(x, y - 1, x_size, y_size, trail_map, trail_heads)
-
-    # bottom
-    if y < y_size - 1 and trail_map[y + 1][x] == current_height + 1:
-        traverse_map(x, y + 1, x_size, y_size, trail_map, trail_heads)
-
-    # left
-    if x > 0 and trail_map[y][x - 1] == current_height + 1:
-        traverse_map(x - 1, y, x_size, y_size, trail_map, trail_heads)
-
-    # right
-    if x < x_size - 1 and trail_map[y][x + 1] == current_height + 1:
-        traverse_map(x + 1, y, x_size, y_size, trail_map, trail_heads)
-
-
-def traverse_map_part2(
-    x: int,
-    y: int,
-    x_size: int,
-    y_size: int,
-    current_path: list[Tuple[int, int]],
-    trail_map: list[list[int]],
-    trail_paths: list[Tuple[int, int]],
-):
-
-    current_path.append((x, y))
-
-    if x >= x_size or y >= y_size or x < 0 or y < 0:
-        return
-
-    current_height = trail_map[y][x]
-    if current_height == 9:
-        trail_paths.append(current_path)
-        return
-
-    # top
-    if y > 0 and trail_map[y - 1][x] == current_height + 1:
-        traverse_map_part2(
-            x, y - 1, x_size, y_size, current_path.copy(), trail_map, trail_paths
-        )
-
-    # bottom
-    if y < y_size - 1 and trail_map[y + 1][x] == current_height + 1:
-        traverse_map_part2(
-            x, y + 1, x_size, y_size, current_path.copy(), trail_map, trail_paths
-        )
-
-    # left
-    if x > 0 and trail_map[y][x - 1] == current_height + 1:
-        traverse_map_part2(
-            x - 1, y, x_size, y_size, current_path.copy(), trail_map, trail_paths
-        )
-
-    # right
-    if x < x_size - 1 and trail_map[y][x + 1] == current_height + 1:
-        traverse_map_part2(
-            x + 1, y, x_size, y_size, current_path.copy(), trail_map, trail_paths
-        )
-
-
-def solve_part1() -> int:
-    # input = read_lines("input/day10/example.txt")
-    input = read_lines("input/day10/part1.txt")
-
-    trail_map = parse_map(input)
-    x_size = len(trail_map[0])
-    y_size = len(trail_map)
+from operator import add, or_
+from typing import Callable
+from src.common.grid import Grid
 
-    total = 0
-    for y in range(0, len(trail_map)):
-        for x in range(0, len(trail_map[y])):
-            if trail_map[y][x] == 0:
-                trail_heads = set()
-                traverse_map(x, y, x_size, y_size, trail_map, trail_heads)
-                # print(f"Trails at ({x},{y}): {trail_heads}")
-                total += len(trail_heads)
-
-    return total
-
-
-def solve_part2() -> int:
-    # input = read_lines("input/day10/example.txt")
-    input = read_lines("input/day10/part1.txt")
-
-    trail_map = parse_map(input)
-    x_size = len(trail_map[0])
-    y_size = len(trail_map)
-
-    total = 0
-    for y in range(0, len(trail_map)):
-        for x in range(0, len(trail_map[y])):
-
-            if trail_map[y][x] == 0:
-                trail_paths = []
-                traverse_map_part2(x, y, x_size, y_size, [], trail_map, trail_paths)
-                # print(f"Trails at ({x},{y}): {len(trail_paths)}")
-                # print(trail_paths)
-                total += len(trail_paths)
-
-    return total
+# heights are compared on the raw bytes of the map
+HEIGHT_0 = ord("0")
+HEIGHT_9 = ord("9")
+
+
+def trail_values(
+    trail_map: Grid,
+    summit_value: Callable[[int], int],
+    merge: Callable[[int, int], int],
+) -> list[int]:
+    """Flow values from the summits down to the trailheads, one height at a time.
+
+    Cells are grouped by height, then every cell of height h merges the values
+    of its neighbors of height h + 1, which are all final by then. Each cell
+    and each edge is visited once, without recursion.
+
+    Args:
+        trail_map (Grid): topographic map
+        summit_value (Callable[[int], int]): value of the n-th summit
+        merge (Callable[[int, int], int]): combines the values of two trails
+
+    Returns:
+        list[int]: value of every trailhead, in reading order
+    """
+    width = trail_map.width
+
+    layers = [
+        [y * width + x for x, y in trail_map.find_all(chr(height))]
+        for height in range(HEIGHT_0, HEIGHT_9 + 1)
+    ]
+
+    values = [0] * (width * trail_map.height)
+    for i, cell in enumerate(layers[-1]):
+        values[cell] = summit_value(i)
+
+    for height in range(HEIGHT_9 - 1, HEIGHT_0 - 1, -1):
+        for cell in layers[height - HEIGHT_0]:
+            y, x = divmod(cell, width)
+
+            value = 0
+            for nx, ny in trail_map.neighbors(x, y):
+                if trail_map.byte(nx, ny) == height + 1:
+                    value = merge(value, values[ny * width + nx])
+
+            values[cell] = value
+
+    return [values[cell] for cell in layers[0]]
+
+
+def solve_part1(source: str | list[str] = "input/day10/part1.txt") -> int:
+    trail_map = Grid.from_source(source)
+
+    # score: reachable summits, as a bitset with one bit per summit
+    reachable = trail_values(trail_map, lambda i: 1 << i, or_)
+
+    return sum(summits.bit_count() for summits in reachable)
+
+
+def solve_part2(source: str | list[str] = "input/day10/part1.txt") -> int:
+    trail_map = Grid.from_source(source)
+
+    # rating: number of distinct trails, summed over the branches
+    ratings = trail_values(trail_map, lambda i: 1, add)
+
+    return sum(ratings)
@@ -1,98 +1,285 @@
-from enum import Enum
-from functools import cache
-from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
+from bisect import bisect_right
+import os
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Iterable, Tuple
+from src.common.cache import resolve_cache_dir
+from src.common.file_utils import read_input
 import re
-from pydantic import BaseModel
-import concurrent.futures
 
+# POWERS_OF_TEN[i] = 10 ** (i + 1), enough for the values met in practice
+POWERS_OF_TEN = [10**i for i in range(1, 64)]
 
-# part 1 , hard simulation of the blink logic as described in the problem
-def simulate_blink_step(input: list[int]):
+# distinct stone values whose transition is remembered
+TRANSITION_CACHE_SIZE = 1 << 16
 
-    result = []
 
-    for i in range(0, len(input)):
+def count_digits(value: int) -> int:
+    if value < POWERS_OF_TEN[-1]:
+        return bisect_right(POWERS_OF_TEN, value) + 1
 
-        # If the stone is engraved with the number 0, it is replaced by a stone engraved with the number 1.
-        if input[i] == 0:
-            result.append(1)
+    return len(str(value))
 
-        # If the stone is engraved with a number that has an even number of digits, it is replaced by two stones.
-        #   The left half of the digits are engraved on the new left stone, and the right half of the digits are engraved on the new right stone.
-        #   (The new numbers don't keep extra leading zeroes: 1000 would become stones 10 and 0.)
-        elif len(str(input[i])) % 2 == 0:
-            s = str(input[i])
-            result.append(int(s[0 : len(s) // 2]))
-            result.append(int(s[len(s) // 2 :]))
 
-        # If none of the other rules apply, the stone is replaced by a new stone; the old stone's number multiplied by 2024 is engraved on the new stone.
-        else:
-            result.append(input[i] * 2024)
-
-    return result
-
-
-# part 2 , simplified / memoizable version of the blink logic as described in the problem
-@cache
-def simulate_blink_logic(input: int) -> list[int]:
+@lru_cache(maxsize=TRANSITION_CACHE_SIZE)
+def simulate_blink_logic(input: int) -> Tuple[int, ...]:
     # If the stone is engraved with the number 0, it is replaced by a stone engraved with the number 1.
     if input == 0:
-        return [1]
-
-    s = str(input)
-    len_input = len(s)
+        return (1,)
 
     # If the stone is engraved with a number that has an even number of digits, it is replaced by two stones.
     #   The left half of the digits are engraved on the new left stone, and the right half of the digits are engraved on the new right stone.
     #   (The new numbers don't keep extra leading zeroes: 1000 would become stones 10 and 0.)
-    if len_input % 2 == 0:
-        return [int(s[0 : len_input // 2]), int(s[len_input // 2 :])]
+    digits = count_digits(input)
+    if digits % 2 == 0:
+        return divmod(input, 10 ** (digits // 2))
 
     # If none of the other rules apply, the stone is replaced by a new stone; the old stone's number multiplied by 2024 is engraved on the new stone.
-    return [input * 2024]
+    return (input * 2024,)
 
 
-def solve_part1() -> int:
-    # input = read_lines("input/day11/example.txt")
-    input = read_lines("input/day11/part1.txt")
-    numbers = [int(n) for n in re.findall(r"\d+", input[0])]
+class BlinkEngine:
+    """Count stones after any number of blinks, reusing the work across queries.
 
-    for i in range(25):
-        numbers = simulate_blink_step(numbers)
+    Stones never interact, and a value always turns into the same stones, so
+    the engine works on the set of values reachable from the stones seen so
+    far (a few thousand at most in practice). An expansion table holds, for
+    every one of these values, the number of stones it becomes after a given
+    number of blinks. Tables are built from the closest smaller table, and
+    the most recently used ones are kept.
+    """
 
-    return len(numbers)
+    def __init__(self, max_tables: int = 8):
+        # reachable values, and the indexes of the one or two stones each one
+        # turns into, a missing right stone points at the trailing 0 of tables
+        self.values: list[int] = []
+        self.index: dict[int, int] = {}
+        self.left: list[int] = []
+        self.right: list[int] = []
 
+        # blinks -> stones per value, indexed like values, with a trailing 0
+        self.tables: OrderedDict[int, list[int]] = OrderedDict()
+        self.max_tables = max_tables
+
+    def add_values(self, values: Iterable[int]):
+        # extend the reachable values, every child of a known value is known
+        pending = [v for v in values if v not in self.index]
+        first_new = len(self.values)
+
+        while pending:
+            value = pending.pop()
+            if value in self.index:
+                continue
+
+            self.index[value] = len(self.values)
+            self.values.append(value)
+            pending.extend(simulate_blink_logic(value))
+
+        if len(self.values) == first_new:
+            return
+
+        for value in self.values[len(self.left) :]:
+            children = [self.index[child] for child in simulate_blink_logic(value)]
+            self.left.append(children[0])
+            self.right.append(children[1] if len(children) > 1 else -1)
+
+        # tables do not cover the new values
+        self.tables.clear()
+
+    def expansion_table(self, blinks: int) -> list[int]:
+        """Number of stones every known value becomes after some blinks.
+
+        Args:
+            blinks (int): number of blinks
+
+        Returns:
+            list[int]: stones per value, indexed like values, then a 0
+        """
+        if blinks in self.tables:
+            self.tables.move_to_end(blinks)
+            return self.tables[blinks]
+
+        start = max((b for b in self.tables if b < blinks), default=0)
+        counts = self.tables[start] if start > 0 else [1] * len(self.values) + [0]
+
+        for _ in range(start, blinks):
+            counts = [counts[a] + counts[b] for a, b in zip(self.left, self.right)]
+            counts.append(0)
+
+        self.tables[blinks] = counts
+        if len(self.tables) > self.max_tables:
+            self.tables.popitem(last=False)
+
+        return counts
+
+    def count(self, stones: Iterable[int], blinks: int) -> int:
+        """Count the stones of a line after some blinks.
+
+        Args:
+            stones (Iterable[int]): values engraved on the stones
+            blinks (int): number of blinks
+
+        Returns:
+            int: number of stones
+        """
+        # all the stones of the line as a single multiset
+        multiset = Counter(stones)
+        self.add_values(multiset)
+
+        table = self.expansion_table(blinks)
+
+        return sum(n * table[self.index[value]] for value, n in multiset.items())
+
+
+# shared by every query of the process
+ENGINE = BlinkEngine()
+
+
+def reset_state():
+    # forget every memo, the next query runs as in a fresh process
+    global ENGINE
+
+    ENGINE = BlinkEngine()
+    simulate_blink_logic.cache_clear()
+
+    STONE_CACHE.clear()
+    _loaded_snapshots.clear()
+
+
+# (value, blinks) -> stones, most recently used last
+STONE_CACHE: OrderedDict[Tuple[int, int], int] = OrderedDict()
+MAX_STONE_CACHE_ENTRIES = 1 << 20
+
+# snapshot of STONE_CACHE, in a subdirectory of the cache directory so the
+# eviction and clearing of the parsed inputs (src.common.cache) leave it alone
+SNAPSHOT_NAME = "day11/stones.pickle"
+
+# snapshots already merged into STONE_CACHE by this process
+_loaded_snapshots: set[str] = set()
 
-def solve_part2() -> int:
-    # input = read_lines("input/day11/example.txt")
-    input = read_lines("input/day11/part1.txt")
-    numbers = [int(n) for n in re.findall(r"\d+", input[0])]
 
-    # since the number of states involed in 75 blinks is too large, we will simplify
-    # the problem.
-    # firstly, every number can be evaluated independently of the others since they
-    #   never interact with each other.
-    # secondly, since the result for a given number will never change, no matter where it is
-    #   located, we can simplify the calculation by combining all of the numbers into a dictionary.
-    #   the sequence length is what matter for this problem , so we can ignore the actual sequence
-    # using these two simplifications, we can calculate the result for each individual number and the
-    #   resulting length of sequence at the end.
-    # a @cache decorator is used to enable memoization for the function simulate_blink_logic
+def count_stones(stones: Iterable[int], blinks: int) -> int:
+    """Count the stones of a line after some blinks, one cached value at a time.
+
+    Every stone value is looked up in STONE_CACHE. The missing ones are
+    counted together by the blink engine and cached, so common stones are
+    answered in O(1) across lines, and across processes once the cache is
+    saved with save_stone_cache.
+
+    Args:
+        stones (Iterable[int]): values engraved on the stones
+        blinks (int): number of blinks
+
+    Returns:
+        int: number of stones
+    """
+    multiset = Counter(stones)
+
+    missing = [value for value in multiset if (value, blinks) not in STONE_CACHE]
+    if missing:
+        ENGINE.add_values(missing)
+        table = ENGINE.expansion_table(blinks)
+        for value in missing:
+            STONE_CACHE[(value, blinks)] = table[ENGINE.index[value]]
 
     total = 0
-    for n in numbers:
-        number_results = {n: 1}
-        for step in range(75):
-            numbers_next = {}
-            for k, v in number_results.items():
-                for r in simulate_blink_logic(k):
-                    numbers_next.setdefault(r, 0)
-                    numbers_next[r] += v
+    for value, n in multiset.items():
+        STONE_CACHE.move_to_end((value, blinks))
+        total += n * STONE_CACHE[(value, blinks)]
+
+    while len(STONE_CACHE) > MAX_STONE_CACHE_ENTRIES:
+        STONE_CACHE.popitem(last=False)
+
+    return total
+
+
+def _read_snapshot(path: str) -> dict[Tuple[int, int], int]:
+    # pickle is only imported when snapshots are used
+    import pickle
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+
+
+def _merge_snapshot(snapshot: dict[Tuple[int, int], int]):
+    # entries of this process win and stay the most recently used, the
+    # snapshot goes in front of them, in its own order
+    for key in reversed(snapshot):
+        if key not in STONE_CACHE:
+            STONE_CACHE[key] = snapshot[key]
+            STONE_CACHE.move_to_end(key, last=False)
+
+    while len(STONE_CACHE) > MAX_STONE_CACHE_ENTRIES:
+        STONE_CACHE.popitem(last=False)
+
+
+def save_stone_cache(path: str):
+    """Write a snapshot of STONE_CACHE, to be warm loaded by another process.
+
+    The snapshot on disk is merged first, so processes sharing it (ex: both
+    parts run concurrently) do not drop each other's entries.
+
+    Args:
+        path (str): path to the snapshot file
+    """
+    import pickle
 
-            number_results = numbers_next
+    _merge_snapshot(_read_snapshot(path))
 
-        total += sum([v for k, v in number_results.items()])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # write then rename, a concurrent reader never sees a partial snapshot
+    with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+        pickle.dump(dict(STONE_CACHE), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+
+def load_stone_cache(path: str) -> int:
+    """Warm STONE_CACHE from a snapshot written by save_stone_cache.
+
+    A missing or unreadable snapshot leaves the cache as is.
+
+    Args:
+        path (str): path to the snapshot file
+
+    Returns:
+        int: number of entries loaded
+    """
+    snapshot = _read_snapshot(path)
+    _merge_snapshot(snapshot)
+
+    return len(snapshot)
+
+
+def solve_stones(source: str | list[str], blinks: int) -> int:
+    input = read_input(source)
+    numbers = [int(n) for n in re.findall(r"\d+", input[0])]
+
+    # the snapshot follows the parsed inputs, if they are persisted
+    cache_dir = resolve_cache_dir()
+    if not cache_dir:
+        return count_stones(numbers, blinks)
+
+    path = f"{cache_dir}/{SNAPSHOT_NAME}"
+    if path not in _loaded_snapshots:
+        load_stone_cache(path)
+        _loaded_snapshots.add(path)
+
+    # only write the snapshot back when it is missing some of the stones
+    known = len(STONE_CACHE)
+    total = count_stones(numbers, blinks)
+    if len(STONE_CACHE) != known or not os.path.exists(path):
+        save_stone_cache(path)
 
     return total
+
+
+def solve_part1(source: str | list[str] = "input/day11/part1.txt") -> int:
+    return solve_stones(source, 25)
+
+
+def solve_part2(source: str | list[str] = "input/day11/part1.txt") -> int:
+    return solve_stones(source, 75)
@@ -1,228 +1,131 @@
-from enum import Enum
-from functools import cache
-from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
-import re
-from pydantic import BaseModel
-import concurrent.futures
-
-
-def parse_input(input: list[str]) -> list[list[chr]]:
-    return [list(line[:-1]) for line in input]
-
-
-class NodePosition(BaseModel):
-    x: int
-    y: int
-
-
-class Region(BaseModel):
-    node_type: str
-    x0: int
-    y0: int
-    nodes: list[NodePosition] = []
-
-    def get_perimeter(self):
-        x_min = min([n.x for n in self.nodes])
-        x_max = max([n.x for n in self.nodes])
-        y_min = min([n.y for n in self.nodes])
-        y_max = max([n.y for n in self.nodes])
-
-        fences = 0
-
-        nodes = set([(n.x, n.y) for n in self.nodes])
-
-        for node in nodes:
-            if node[0] > x_min and (node[0] - 1, node[1]) not in nodes:
-                fences += 1
-            elif node[0] == x_min:
-                fences += 1
-
-            if node[0] < x_max and (node[0] + 1, node[1]) not in nodes:
-                fences += 1
-            elif node[0] == x_max:
-                fences += 1
-
-            if node[1] > y_min and (node[0], node[1] - 1) not in nodes:
-                fences += 1
-            elif node[1] == y_min:
-                fences += 1
-
-            if node[1] < y_max and (node[0], node[1] + 1) not in nodes:
-                fences += 1
-            elif node[1] == y_max:
-                fences += 1
-
-        # print()
-        # for y in range(y_min, y_max + 1):
-        #     for x in range(x_min, x_max + 1):
-        #         if (x, y) in nodes:
-        #             print("#", end="")
-        #         else:
-        #             print(".", end="")
-
-        #     print()
-
-        return fences
-
-    def get_sides(self):
-
-        x_min = min([n.x for n in self.nodes])
-        x_max = max([n.x for n in self.nodes])
-        y_min = min([n.y for n in self.nodes])
-        y_max = max([n.y for n in self.nodes])
-
-        nodes = set([(n.x, n.y) for n in self.nodes])
-
-        nodes_fence = {}
-
-        # merge fences, checking in the direction away from x_min,y_min
-        # first walk the perimeter as per part1 , but then remove fences that are adjacent
-        sides = 0
-        for node in nodes:
-
-            up = False
-            right = False
-            down = False
-            left = False
-
-            # left side
-            if node[0] == x_min or (
-                node[0] > x_min and (node[0] - 1, node[1]) not in nodes
-            ):
-                sides += 1
-                left = True
-
-            # right side
-            if node[0] == x_max or (
-                node[0] < x_max and (node[0] + 1, node[1]) not in nodes
+from array import array
+from typing import NamedTuple
+from src.common.cache import cached_parse
+from src.common.grid import Grid
+
+# byte around the padded map, never a plant
+BORDER = 0
+
+
+def parse_input(input: list[str]) -> Grid:
+    return Grid.from_lines(input)
+
+
+class Region(NamedTuple):
+    plant: str
+    area: int
+    perimeter: int
+    # a polygon has as many sides as corners
+    sides: int
+
+
+def pad_map(garden_map: Grid) -> bytes:
+    # one border cell around the map, neighbors never need a bounds check
+    width = garden_map.width + 2
+    border = bytes([BORDER]) * width
+    rows = [
+        bytes([BORDER]) + garden_map.row(y) + bytes([BORDER])
+        for y in range(garden_map.height)
+    ]
+
+    return border + b"".join(rows) + border
+
+
+def label_regions(garden_map: Grid) -> list[Region]:
+    """Label the regions of a garden with a union-find, in one raster pass.
+
+    Labels live in a flat array over the padded map. Every cell joins the
+    region of its left and upper neighbors when they hold the same plant, and
+    adds its area, fences and corners to the root of its region, the totals of
+    two regions being summed when they merge. No recursion, no per cell object.
+
+    Args:
+        garden_map (Grid): map of the garden plots
+
+    Returns:
+        list[Region]: every region of the garden
+    """
+    width = garden_map.width + 2
+    cells = pad_map(garden_map)
+
+    # parent label of every cell, and the totals of the roots
+    parent = array("i", range(len(cells)))
+    area = array("q", bytes(8 * len(cells)))
+    perimeter = array("q", bytes(8 * len(cells)))
+    corners = array("q", bytes(8 * len(cells)))
+
+    def find(label: int) -> int:
+        # path halving
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(a: int, b: int) -> int:
+        a = find(a)
+        b = find(b)
+        if a == b:
+            return a
+
+        # the larger region stays the root
+        if area[a] < area[b]:
+            a, b = b, a
+
+        parent[b] = a
+        area[a] += area[b]
+        perimeter[a] += perimeter[b]
+        corners[a] += corners[b]
+        return a
+
+    for y in range(1, garden_map.height + 1):
+        for i in range(y * width + 1, y * width + width - 1):
+            plant = cells[i]
+
+            up = cells[i - width] == plant
+            down = cells[i + width] == plant
+            left = cells[i - 1] == plant
+            right = cells[i + 1] == plant
+
+            # a corner is convex (both sides open) or concave (diagonal open)
+            cell_corners = 0
+            for side_a, side_b, diagonal in (
+                (up, left, i - width - 1),
+                (up, right, i - width + 1),
+                (down, left, i + width - 1),
+                (down, right, i + width + 1),
             ):
-                sides += 1
-                right = True
-
-            # top side
-            if node[1] == y_min or (
-                node[1] > y_min and (node[0], node[1] - 1) not in nodes
-            ):
-                sides += 1
-                up = True
-
-            # bottom side
-            if node[1] == y_max or (
-                node[1] < y_max and (node[0], node[1] + 1) not in nodes
-            ):
-                sides += 1
-                down = True
-
-            nodes_fence[node] = (up, right, down, left)
-
-        # adjacent fences, check away from x_min,y_min
-        for node in nodes:
-
-            if (node[0], node[1] + 1) in nodes:
-
-                if nodes_fence[node][1] and nodes_fence[(node[0], node[1] + 1)][1]:
-                    sides -= 1
-
-                if nodes_fence[node][3] and nodes_fence[(node[0], node[1] + 1)][3]:
-                    sides -= 1
-
-            if (node[0] + 1, node[1]) in nodes:
-
-                if nodes_fence[node][0] and nodes_fence[(node[0] + 1, node[1])][0]:
-                    sides -= 1
-
-                if nodes_fence[node][2] and nodes_fence[(node[0] + 1, node[1])][2]:
-                    sides -= 1
-
-        return sides
-
-    def get_area(self):
-        return len(self.nodes)
-
-
-def scan_regions(garden_map: list[list[chr]]) -> list[Region]:
-
-    map_height = len(garden_map)
-    map_width = len(garden_map[0])
-
-    regions = []
-
-    solved = [[False for x in range(map_width)] for y in range(map_height)]
-
-    for y in range(map_height):
-        for x in range(map_width):
-
-            if solved[y][x]:
-                continue
-
-            c = garden_map[y][x]
-            current_region: set[Tuple[int, int]] = set()
-            explore_region(x, y, map_width, map_height, garden_map, c, current_region)
-
-            nodes = [NodePosition(x=t[0], y=t[1]) for t in current_region]
-            region = Region(node_type=str(c), x0=x, y0=y, nodes=nodes)
-            regions.append(region)
-
-            for node in current_region:
-                solved[node[1]][node[0]] = True
-
-    return regions
-
-
-def explore_region(
-    x: int,
-    y: int,
-    x_len: int,
-    y_len: int,
-    garden_map: list[list[chr]],
-    c: chr,
-    adjacent_nodes: set[Tuple[int, int]],
-):
-
-    if x < 0 or y < 0 or x >= x_len or y >= y_len:
-        return
-
-    if garden_map[y][x] != c:
-        return
-
-    if (x, y) in adjacent_nodes:
-        return
+                if side_a == side_b and (not side_a or cells[diagonal] != plant):
+                    cell_corners += 1
 
-    adjacent_nodes.add((x, y))
+            root = i
+            if left:
+                root = parent[i] = find(i - 1)
 
-    explore_region(x - 1, y, x_len, y_len, garden_map, c, adjacent_nodes)
-    explore_region(x + 1, y, x_len, y_len, garden_map, c, adjacent_nodes)
-    explore_region(x, y - 1, x_len, y_len, garden_map, c, adjacent_nodes)
-    explore_region(x, y + 1, x_len, y_len, garden_map, c, adjacent_nodes)
+            area[root] += 1
+            perimeter[root] += 4 - up - down - left - right
+            corners[root] += cell_corners
 
+            if up:
+                union(root, i - width)
 
-def solve_part1() -> int:
-    # input = read_lines("input/day12/example.txt")
-    input = read_lines("input/day12/part1.txt")
+    return [
+        Region(chr(cells[i]), area[i], perimeter[i], corners[i])
+        for i in range(len(cells))
+        if parent[i] == i and area[i] > 0
+    ]
 
-    garden_map = parse_input(input)
-    regions = scan_regions(garden_map)
 
-    price = 0
-    for region in regions:
-        # print(f"Region {region.node_type} at {region.x0},{region.y0} Area: {region.get_area()} Perimeter: {region.get_perimeter()}")
-        price += region.get_area() * region.get_perimeter()
+def parse_regions(input: list[str]) -> list[Region]:
+    return label_regions(parse_input(input))
 
-    return price
 
+def solve_part1(source: str | list[str] = "input/day12/part1.txt") -> int:
+    regions = cached_parse(source, parse_regions)
 
-def solve_part2() -> int:
-    # input = read_lines("input/day12/example.txt")
-    input = read_lines("input/day12/part1.txt")
+    return sum(region.area * region.perimeter for region in regions)
 
-    garden_map = parse_input(input)
-    regions = scan_regions(garden_map)
 
-    price = 0
-    for region in regions:
-        # print(f"Region {region.node_type} at {region.x0},{region.y0} Area: {region.get_area()} Perimeter:{region.get_perimeter()} Sides: {region.get_sides()}")
-        price += region.get_area() * region.get_sides()
+def solve_part2(source: str | list[str] = "input/day12/part1.txt") -> int:
+    regions = cached_parse(source, parse_regions)
 
-    return price
+    return sum(region.area * region.sides for region in regions)
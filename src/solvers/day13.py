@@ -1,45 +1,54 @@
-from enum import Enum
-from functools import cache
-from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
+from typing import Iterable, Iterator, Tuple
+from src.common.file_utils import iter_lines
 import re
-from pydantic import BaseModel
-import concurrent.futures
 
 
-class MachineDefinition(BaseModel):
-    button_a_x: int = 0
-    button_a_y: int = 0
-    button_b_x: int = 0
-    button_b_y: int = 0
-    prize_x: int = 0
-    prize_y: int = 0
+class MachineDefinition:
+    __slots__ = (
+        "button_a_x",
+        "button_a_y",
+        "button_b_x",
+        "button_b_y",
+        "prize_x",
+        "prize_y",
+    )
+
+    def __init__(
+        self,
+        button_a_x: int = 0,
+        button_a_y: int = 0,
+        button_b_x: int = 0,
+        button_b_y: int = 0,
+        prize_x: int = 0,
+        prize_y: int = 0,
+    ):
+        self.button_a_x = button_a_x
+        self.button_a_y = button_a_y
+        self.button_b_x = button_b_x
+        self.button_b_y = button_b_y
+        self.prize_x = prize_x
+        self.prize_y = prize_y
 
 
-def parse_input(input: list[str]) -> list[MachineDefinition]:
+NUMBER = re.compile(r"\d+")
 
-    machines: list[MachineDefinition] = []
 
+def parse_input(records: Iterable[list[str]]) -> Iterator[MachineDefinition]:
+    # machines are yielded as soon as their prize line is read
     current_machine = MachineDefinition()
-    for i in range(len(input)):
+    for i, numbers in enumerate(records):
         if i % 4 == 0:
-            numbers = numbers = [int(n) for n in re.findall(r"\d+", input[i])]
-            current_machine.button_a_x = numbers[0]
-            current_machine.button_a_y = numbers[1]
+            current_machine.button_a_x = int(numbers[0])
+            current_machine.button_a_y = int(numbers[1])
         elif i % 4 == 1:
-            numbers = numbers = [int(n) for n in re.findall(r"\d+", input[i])]
-            current_machine.button_b_x = numbers[0]
-            current_machine.button_b_y = numbers[1]
+            current_machine.button_b_x = int(numbers[0])
+            current_machine.button_b_y = int(numbers[1])
         elif i % 4 == 2:
-            numbers = numbers = [int(n) for n in re.findall(r"\d+", input[i])]
-            current_machine.prize_x = numbers[0]
-            current_machine.prize_y = numbers[1]
-            machines.append(current_machine)
+            current_machine.prize_x = int(numbers[0])
+            current_machine.prize_y = int(numbers[1])
+            yield current_machine
             current_machine = MachineDefinition()
 
-    return machines
-
 
 # def solve_machine_movement_iterate(machine: MachineDefinition) -> Tuple[int,int]|None:
 
@@ -113,14 +122,11 @@ def solve_machine_movement_2(machine: MachineDefinition) -> Tuple[int, int] | No
     return None
 
 
-def solve_part1() -> int:
+def solve_part1(source: str | list[str] = "input/day13/part1.txt") -> int:
 
     # 29187
 
-    # input = read_lines("input/day13/example.txt")
-    input = read_lines("input/day13/part1.txt")
-
-    machines = parse_input(input)
+    machines = parse_input(iter_lines(source, NUMBER.findall))
 
     total = 0
     for machine in machines:
@@ -140,11 +146,8 @@ def solve_part1() -> int:
     return total
 
 
-def solve_part2() -> int:
-    # input = read_lines("input/day13/example.txt")
-    input = read_lines("input/day13/part1.txt")
-
-    machines = parse_input(input)
+def solve_part2(source: str | list[str] = "input/day13/part1.txt") -> int:
+    machines = parse_input(iter_lines(source, NUMBER.findall))
 
     total = 0
     for machine in machines:
@@ -1,61 +1,56 @@
-from enum import Enum
-from functools import cache
 from itertools import repeat
-from typing import Tuple
-from src.common.file_utils import read_lines
+from typing import Iterable, Iterator, Tuple
+from src.common.file_utils import iter_lines
 import re
-from pydantic import BaseModel
-import concurrent.futures
 
-# input
+# input, the example uses a (11, 7) map
 MAPSIZE_X = 101
 MAPSIZE_Y = 103
 
-# example
-# MAPSIZE_X = 11
-# MAPSIZE_Y = 7
 
+class RobotState:
+    __slots__ = ("px", "py", "vx", "vy")
 
-class RobotState(BaseModel):
-    px: int = 0
-    py: int = 0
-    vx: int = 0
-    vy: int = 0
+    def __init__(self, px: int = 0, py: int = 0, vx: int = 0, vy: int = 0):
+        self.px = px
+        self.py = py
+        self.vx = vx
+        self.vy = vy
 
-    def animate(self):
+    def animate(self, map_size_x: int, map_size_y: int):
         self.px += self.vx
         self.py += self.vy
 
         while self.px < 0:
-            self.px += MAPSIZE_X
+            self.px += map_size_x
 
-        while self.px >= MAPSIZE_X:
-            self.px -= MAPSIZE_X
+        while self.px >= map_size_x:
+            self.px -= map_size_x
 
         while self.py < 0:
-            self.py += MAPSIZE_Y
+            self.py += map_size_y
 
-        while self.py >= MAPSIZE_Y:
-            self.py -= MAPSIZE_Y
+        while self.py >= map_size_y:
+            self.py -= map_size_y
 
 
-def parse_input(input: list[str]) -> list[RobotState]:
+SIGNED_NUMBER = re.compile(r"-?\d+")
 
-    robots: list[RobotState] = []
-
-    for i in range(len(input)):
-        numbers = [int(n) for n in re.findall(r"-?\d+", input[i])]
 
+def parse_input(records: Iterable[list[str]]) -> Iterator[RobotState]:
+    for numbers in records:
         if len(numbers) == 4:
-            robot = RobotState(
-                px=numbers[0], py=numbers[1], vx=numbers[2], vy=numbers[3]
+            yield RobotState(
+                px=int(numbers[0]),
+                py=int(numbers[1]),
+                vx=int(numbers[2]),
+                vy=int(numbers[3]),
             )
-            robots.append(robot)
-
-    return robots
 
 
-def calculate_safety_factor(robots: list[RobotState]) -> int:
+def calculate_safety_factor(
+    robots: list[RobotState], map_size_x: int, map_size_y: int
+) -> int:
     # count number of robots in each quadrants
     tl = 0
     tr = 0
@@ -63,13 +58,13 @@ def calculate_safety_factor(robots: list[RobotState]) -> int:
     br = 0
 
     for robot in robots:
-        if robot.px < MAPSIZE_X // 2 and robot.py < MAPSIZE_Y // 2:
+        if robot.px < map_size_x // 2 and robot.py < map_size_y // 2:
             tl += 1
-        elif robot.px > MAPSIZE_X // 2 and robot.py < MAPSIZE_Y // 2:
+        elif robot.px > map_size_x // 2 and robot.py < map_size_y // 2:
             tr += 1
-        elif robot.px < MAPSIZE_X // 2 and robot.py > MAPSIZE_Y // 2:
+        elif robot.px < map_size_x // 2 and robot.py > map_size_y // 2:
             bl += 1
-        elif robot.px > MAPSIZE_X // 2 and robot.py > MAPSIZE_Y // 2:
+        elif robot.px > map_size_x // 2 and robot.py > map_size_y // 2:
             br += 1
 
     print("TL:", tl, "TR:", tr, "BL:", bl, "BR:", br, "TOTAL:", tl * tr * bl * br)
@@ -77,28 +72,31 @@ def calculate_safety_factor(robots: list[RobotState]) -> int:
     return tl * tr * bl * br
 
 
-def solve_part1() -> int:
+def solve_part1(
+    source: str | list[str] = "input/day14/part1.txt",
+    map_size: Tuple[int, int] = (MAPSIZE_X, MAPSIZE_Y),
+) -> int:
     # 228690000
 
-    # input = read_lines("input/day14/example.txt")
-    input = read_lines("input/day14/part1.txt")
-    robots = parse_input(input)
+    robots = list(parse_input(iter_lines(source, SIGNED_NUMBER.findall)))
 
     for i in range(1, 101):
         for robot in robots:
-            robot.animate()
+            robot.animate(*map_size)
 
-    return calculate_safety_factor(robots)
+    return calculate_safety_factor(robots, *map_size)
 
 
-def print_map(robots: list[RobotState]):
-    robot_map = [[0 for x in repeat(None, MAPSIZE_X)] for y in repeat(None, MAPSIZE_Y)]
+def print_map(robots: list[RobotState], map_size_x: int, map_size_y: int):
+    robot_map = [
+        [0 for x in repeat(None, map_size_x)] for y in repeat(None, map_size_y)
+    ]
 
     for robot in robots:
         robot_map[robot.py][robot.px] += 1
 
-    for y in range(MAPSIZE_Y):
-        for x in range(MAPSIZE_X):
+    for y in range(map_size_y):
+        for x in range(map_size_x):
             if robot_map[y][x] > 0:
                 print(f"{robot_map[y][x]}", end="")
             else:
@@ -116,11 +114,11 @@ def test_easter_egg(robots: list[RobotState]) -> bool:
     return len(unique_positions) == len(robots)
 
 
-def solve_part2() -> int:
-    # input = read_lines("input/day14/example.txt")
-
-    input = read_lines("input/day14/part1.txt")
-    robots = parse_input(input)
+def solve_part2(
+    source: str | list[str] = "input/day14/part1.txt",
+    map_size: Tuple[int, int] = (MAPSIZE_X, MAPSIZE_Y),
+) -> int:
+    robots = list(parse_input(iter_lines(source, SIGNED_NUMBER.findall)))
 
     i = 0
     while not test_easter_egg(robots):
@@ -130,17 +128,17 @@ def solve_part2() -> int:
             print(f"... {i} ...")
 
         for robot in robots:
-            robot.animate()
+            robot.animate(*map_size)
 
         robot_map = [
-            [0 for x in repeat(None, MAPSIZE_X)] for y in repeat(None, MAPSIZE_Y)
+            [0 for x in repeat(None, map_size[0])] for y in repeat(None, map_size[1])
         ]
 
         for robot in robots:
             robot_map[robot.py][robot.px] += 1
 
     print(f"AFTER {i} STEPS")
-    print_map(robots)
+    print_map(robots, *map_size)
 
     return i
 
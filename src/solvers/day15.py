@@ -1,12 +1,6 @@
 from collections import deque
-from enum import Enum
-from functools import cache
-from itertools import repeat
 from typing import Tuple
-from src.common.file_utils import read_lines
-import re
-from pydantic import BaseModel
-import concurrent.futures
+from src.common.file_utils import read_input
 
 
 def parse_input(input: list[str]) -> Tuple[list[list[chr]], list[chr], Tuple[int, int]]:
@@ -158,12 +152,11 @@ def calculate_gps_value(warehouse_map: list[list[chr]]) -> int:
     return total
 
 
-def solve_part1() -> int:
+def solve_part1(source: str | list[str] = "input/day15/part1.txt") -> int:
 
     # 1563092
 
-    # input = read_lines("input/day15/example.txt")
-    input = read_lines("input/day15/part1.txt")
+    input = read_input(source)
 
     warehouse_map, robot_instructions, position = parse_input(input)
 
@@ -375,12 +368,11 @@ def print_bigger_map(bigger_map: list[list[chr]]) -> None:
     print()
 
 
-def solve_part2() -> int:
+def solve_part2(source: str | list[str] = "input/day15/part1.txt") -> int:
 
     # 1582688
 
-    # input = read_lines("input/day15/example.txt")
-    input = read_lines("input/day15/part1.txt")
+    input = read_input(source)
 
     warehouse_map, robot_instructions, position = parse_input(input)
     bigger_map, position = expand_map(warehouse_map, position)
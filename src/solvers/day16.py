@@ -1,5 +1,7 @@
 from enum import Enum
-from tqdm import tqdm
+from src.common.progress import tqdm
+from src.common.cache import cached_parse
+from src.common.grid import Grid
 
 class Orientation(Enum):
     NORTH = 0
@@ -37,25 +39,15 @@ class Position(tuple):
     
 
 
-def parse_maze(input_data: str):
-    maze = {}
-    lines = input_data.strip().splitlines()
-    for y, line in enumerate(lines):
-        for x, char in enumerate(line):
-            maze[(x, y)] = char
-    return maze
+def parse_maze(input_lines: list[str]) -> Grid:
+    return Grid.from_lines(input_lines)
 
-def extract_start_and_end(maze)-> tuple[MapPosition, MapPosition]:
-    start = None
-    goal = None
-    for (x, y), char in maze.items():
-        if char == 'S':
-            start = MapPosition(x, y)
-        elif char == 'E':
-            goal = MapPosition(x, y)
+def extract_start_and_end(maze: Grid)-> tuple[MapPosition, MapPosition]:
+    start = maze.find('S')
+    goal = maze.find('E')
     if start is None or goal is None:
         raise ValueError("Start or Goal position not found in the maze.")
-    return start, goal
+    return MapPosition(*start), MapPosition(*goal)
 
 
 
@@ -72,7 +64,7 @@ def heuristic(pos: Position, goal: MapPosition) -> int:
         min_turns = 1000
     return dx + dy + min_turns
    
-def get_neighbors(maze: dict[tuple[int, int], str], pos: Position) -> list[Position]:
+def get_neighbors(maze: Grid, pos: Position) -> list[Position]:
     neighbors = []
 
     # evaluate moves
@@ -117,7 +109,7 @@ def reconstruct_path(came_from: dict, current: Position) -> list[Position]:
         total_path.append(current)
     return total_path[::-1]
 
-def a_star(maze: dict[tuple[int, int], str], start: Position, goal: MapPosition) -> list[Position]:
+def a_star(maze: Grid, start: Position, goal: MapPosition) -> list[Position]:
     closed_set = set()
     open_set = {start}
     came_from = {}
@@ -159,8 +151,8 @@ def evaluate_path(path: list[Position]) -> int:
             total_cost += 1000  # turning
     return total_cost
 
-def print_maze_with_path(maze: dict[tuple[int, int], str], path: list[Position]) -> None:
-    maze_copy = maze.copy()
+def print_maze_with_path(maze: Grid, path: list[Position]) -> None:
+    maze_copy = dict(maze.items())
     for pos in path:
         maze_copy[(pos.x, pos.y)] = '*'
     max_x = max(x for x, y in maze_copy.keys())
@@ -173,10 +165,8 @@ def print_maze_with_path(maze: dict[tuple[int, int], str], path: list[Position])
 
 
 
-def solve_part1() -> int:
-    # input_data = open("input/day16/example.txt").read()
-    input_data = open("input/day16/part1.txt").read()
-    maze = parse_maze(input_data)
+def solve_part1(source: str | list[str] = "input/day16/part1.txt") -> int:
+    maze = cached_parse(source, parse_maze)
 
     map_start, goal = extract_start_and_end(maze)
     start = Position(map_start.x, map_start.y, Orientation.EAST.value)
@@ -186,7 +176,7 @@ def solve_part1() -> int:
 
 #### Part 2
 
-def find_path_with_midpoint(maze: dict[tuple[int, int], str], start: Position, mid: MapPosition, goal: MapPosition) -> list[Position]:
+def find_path_with_midpoint(maze: Grid, start: Position, mid: MapPosition, goal: MapPosition) -> list[Position]:
     # a* , but with a mandatory midpoint
     path_to_mid = a_star(maze, start, mid)
     if not path_to_mid:
@@ -199,7 +189,7 @@ def find_path_with_midpoint(maze: dict[tuple[int, int], str], start: Position, m
     combined_path = path_to_mid + path_to_goal[1:]
     return combined_path
 
-def get_open_neighbors(maze: dict[tuple[int, int], str], seatable_pos:set[MapPosition]) -> set[MapPosition]:
+def get_open_neighbors(maze: Grid, seatable_pos:set[MapPosition]) -> set[MapPosition]:
     neighbors = set()
     for (x, y), char in maze.items():
         if char not in ('.', 'S', 'E'):
@@ -216,10 +206,8 @@ def get_open_neighbors(maze: dict[tuple[int, int], str], seatable_pos:set[MapPos
                 break
     return neighbors
 
-def solve_part2() -> int:
-    # input_data = open("input/day16/example2.txt").read()
-    input_data = open("input/day16/part1.txt").read()
-    maze = parse_maze(input_data)
+def solve_part2(source: str | list[str] = "input/day16/part1.txt") -> int:
+    maze = cached_parse(source, parse_maze)
     map_start, goal = extract_start_and_end(maze)
     start = Position(map_start.x, map_start.y, Orientation.EAST.value)
 
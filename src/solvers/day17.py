@@ -1,4 +1,4 @@
-from src.common.file_utils import read_lines
+from src.common.file_utils import read_input
 
 
 class Computer():
@@ -176,15 +176,13 @@ class Computer():
         return min_eax
         
             
-def solve_part1() -> str:
-    # lines = read_lines("input/day17/example2.txt")
-    lines = read_lines("input/day17/part1.txt")
+def solve_part1(source: str | list[str] = "input/day17/part1.txt") -> str:
+    lines = read_input(source)
     computer = Computer.parse_input(lines)
     computer.run()
     return ",".join(str(x) for x in computer.output)
 
-def solve_part2() -> int:
-    # lines = read_lines("input/day17/example2.txt")
-    lines = read_lines("input/day17/part1.txt")
+def solve_part2(source: str | list[str] = "input/day17/part1.txt") -> int:
+    lines = read_input(source)
     computer = Computer.parse_input(lines)
     return computer.debug()
\ No newline at end of file
@@ -1,7 +1,21 @@
-from src.common.file_utils import read_lines
+from typing import Iterable
+from src.common.file_utils import iter_lines
 
 
-def build_grid(input_lines:list[str]) -> dict[tuple[int,int],int]:
+class MapPosition(tuple):
+    def __new__(cls, x: int, y: int):
+        return super().__new__(cls, (x, y))
+
+    @property
+    def x(self) -> int:
+        return self[0]
+
+    @property
+    def y(self) -> int:
+        return self[1]
+
+
+def build_grid(input_lines:Iterable[str]) -> dict[tuple[int,int],int]:
     
     maze = {}
     timer = 1
@@ -35,18 +49,6 @@ def print_grid(grid:dict[tuple[int,int],int],elapsed_time:int=0, path:list[MapPo
 
 
 
-class MapPosition(tuple):
-    def __new__(cls, x: int, y: int):
-        return super().__new__(cls, (x, y))
-
-    @property
-    def x(self) -> int:
-        return self[0]
-
-    @property
-    def y(self) -> int:
-        return self[1]
-
 def heuristic(pos: MapPosition, goal: MapPosition) -> int:
     # manahattan distance
     dx = abs(pos.x - goal.x)
@@ -114,38 +116,28 @@ def a_star(maze: dict[tuple[int, int], int], start: MapPosition, goal: MapPositi
     return []  # no path found
 
 
-def solve_part1() -> int:
-    # input_lines = read_lines("input/day18/example.txt")
-    # goal_pos = MapPosition(6,6)
-
-    input_lines = read_lines("input/day18/part1.txt")
-    goal_pos = MapPosition(70,70)
-
+# the example uses a goal at (6,6) and a timer of 12
+def solve_part1(source: str | list[str] = "input/day18/part1.txt", goal:tuple[int,int]=(70,70), timer:int=1024) -> int:
+    input_lines = iter_lines(source)
+    goal_pos = MapPosition(*goal)
 
     grid = build_grid(input_lines)
     start_pos = MapPosition(0,0)
 
-    TIMER = 1024
-    
-    path = a_star(grid, start_pos, goal_pos, time=TIMER)
-    # print_grid(grid, elapsed_time=TIMER, path=path)
+    path = a_star(grid, start_pos, goal_pos, time=timer)
+    # print_grid(grid, elapsed_time=timer, path=path)
 
     return len(path)-1
 
-def solve_part2() -> str:
+def solve_part2(source: str | list[str] = "input/day18/part1.txt", goal:tuple[int,int]=(70,70), timer:int=1024) -> str:
+    input_lines = iter_lines(source)
+    goal_pos = MapPosition(*goal)
 
-    # input_lines = read_lines("input/day18/example.txt")
-    # goal_pos = MapPosition(6,6)
-    # TIMER = 12
-    input_lines = read_lines("input/day18/part1.txt")
-    goal_pos = MapPosition(70,70)
-    TIMER = 1024
-    
     maze = build_grid(input_lines)
     start_pos = MapPosition(0,0)
     
-    path = a_star(maze, start_pos, goal_pos, time=TIMER)
-    print_grid(maze, elapsed_time=TIMER, path=path)
+    path = a_star(maze, start_pos, goal_pos, time=timer)
+    print_grid(maze, elapsed_time=timer, path=path)
 
     falling_blocks = sorted([MapPosition(pos[0], pos[1]) for pos in maze], key=lambda p: maze[p])
 
@@ -154,8 +146,8 @@ def solve_part2() -> str:
             # dont care about positions not in CURRENT path
             continue
 
-        if maze[(pos.x, pos.y)] > TIMER:
-            print(f"Position {pos} is blocked at time {maze[(pos.x, pos.y)]} within TIMER {TIMER}")
+        if maze[(pos.x, pos.y)] > timer:
+            print(f"Position {pos} is blocked at time {maze[(pos.x, pos.y)]} within timer {timer}")
             # recompute the path
             alternate_time = maze[(pos.x, pos.y)]
             path = a_star(maze, start_pos, goal_pos, time=alternate_time)
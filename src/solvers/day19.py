@@ -1,4 +1,4 @@
-from src.common.file_utils import read_lines
+from src.common.file_utils import read_input
 from functools import cache
 
 def find_solutions(towel_patterns: list[str], complex_pattern: str) -> int:
@@ -23,18 +23,16 @@ def find_solutions(towel_patterns: list[str], complex_pattern: str) -> int:
     
     return count_solutions("")
 
-def solve_part1() -> int:
-    # input_lines = read_lines("input/day19/example.txt")
-    input_lines = read_lines("input/day19/part1.txt")
+def solve_part1(source: str | list[str] = "input/day19/part1.txt") -> int:
+    input_lines = read_input(source)
     
     towel_patterns = [towel_pattern.strip() for towel_pattern in input_lines[0].split(",")]
     complex_patterns = [l.strip() for l in input_lines[2:]]
     
     return sum([1 for complex_pattern in complex_patterns if find_solutions(towel_patterns, complex_pattern) > 0])
 
-def solve_part2() -> int:
-    # input_lines = read_lines("input/day19/example.txt")
-    input_lines = read_lines("input/day19/part1.txt")
+def solve_part2(source: str | list[str] = "input/day19/part1.txt") -> int:
+    input_lines = read_input(source)
     
     towel_patterns = [towel_pattern.strip() for towel_pattern in input_lines[0].split(",")]
     complex_patterns = [l.strip() for l in input_lines[2:]]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from src.common.file_utils import read_lines
-from tqdm import tqdm
+from src.common.cache import cached_parse
+from src.common.grid import Grid
+from src.common.progress import tqdm
 
 class MapPosition(tuple[int, int]):
     
@@ -27,26 +27,17 @@ class Racetrack():
 def parse_racetrack(lines: list[str]) -> Racetrack:
     racetrack: list[MapPosition] = []
 
-    start:MapPosition|None = None
-    end:MapPosition|None = None
-    unordered_positions:set[MapPosition] = set()
-    walls:set[MapPosition] = set()
-
-    for y, line in enumerate(lines):
-        for x, char in enumerate(line):
-            if char == "S":
-                start = MapPosition((x, y))
-            elif char == "E":
-                end = MapPosition((x, y))
-            elif char ==".":
-                unordered_positions.add(MapPosition((x, y)))
-            elif char =="#":
-                walls.add(MapPosition((x, y)))
+    grid = Grid.from_lines(lines)
+
+    start = grid.find("S")
+    end = grid.find("E")
+    unordered_positions:set[MapPosition] = {MapPosition(p) for p in grid.find_all(".")}
+    walls:set[MapPosition] = {MapPosition(p) for p in grid.find_all("#")}
 
     if start is None or end is None:
         raise ValueError("Racetrack must have a start and end position.")
 
-    racetrack.append(start)
+    racetrack.append(MapPosition(start))
 
     adjacent_offsets = [(-1,0),(1,0),(0,-1),(0,1)]
     with tqdm(total=len(unordered_positions), desc="Ordering racetrack") as pbar:
@@ -63,7 +54,7 @@ def parse_racetrack(lines: list[str]) -> Racetrack:
                     break
             pbar.update(1)
 
-    racetrack.append(end)
+    racetrack.append(MapPosition(end))
 
     return Racetrack(positions=racetrack, walls=walls)
    
@@ -117,11 +108,8 @@ def part_1_cheats(race_track: Racetrack) -> list[Cheat]:
             pbar.update(1)
     return cheats
 
-def solve_part1() -> int:
-    # input_lines = read_lines("input/day20/example.txt")
-    input_lines = read_lines("input/day20/part1.txt")
-
-    race_track = parse_racetrack(input_lines)
+def solve_part1(source: str | list[str] = "input/day20/part1.txt", min_cheat_value:int=100) -> int:
+    race_track = cached_parse(source, parse_racetrack)
     cheats = part_1_cheats(race_track)
 
     cheat_grouped_by_value:dict[int, int] = {}
@@ -131,18 +119,13 @@ def solve_part1() -> int:
 
     part1= 0
     for value, count in cheat_grouped_by_value.items():
-        if value >= 100:
+        if value >= min_cheat_value:
             part1+=count
     return part1
 
-def solve_part2() -> int:
-    # input_lines = read_lines("input/day20/example.txt")
-    # MIN_CHEAT_VALUE = 50
-
-    input_lines = read_lines("input/day20/part1.txt")
-    MIN_CHEAT_VALUE = 100
-    MAX_CHEAT_DURATION = 20
-    race_track = parse_racetrack(input_lines)
+# the example uses a min cheat value of 50
+def solve_part2(source: str | list[str] = "input/day20/part1.txt", min_cheat_value:int=100, max_cheat_duration:int=20) -> int:
+    race_track = cached_parse(source, parse_racetrack)
 
     part_2 = 0
     # all_cheats:dict[int,int] = {} 
@@ -152,16 +135,16 @@ def solve_part2() -> int:
         for cur in range(len(race_track.positions)):
 
             # pointless to scan for cheats under the threshold, only look ahead the track
-            for look_ahead in range(cur+MIN_CHEAT_VALUE, len(race_track.positions)):
+            for look_ahead in range(cur+min_cheat_value, len(race_track.positions)):
                 # check if we can reach it withing the max cheat duration using
                 #  the manathan distance between that wall and the lookahead position
                 dist = race_track.positions[cur].manhattan_distance(race_track.positions[look_ahead])
-                if dist <= MAX_CHEAT_DURATION: 
+                if dist <= max_cheat_duration: 
                     # by definition , max cheat duration is <<<< to the min cheat value,
                     # check the cheat value again , ajusted for the distance to see if the 
                     # cheat is still considered good
                     cheat_value = look_ahead - cur - dist
-                    if cheat_value >= MIN_CHEAT_VALUE:
+                    if cheat_value >= min_cheat_value:
                         # valid cheat found
                         # all_cheats.setdefault(cheat_value, 0)
                         # all_cheats[cheat_value] +=1